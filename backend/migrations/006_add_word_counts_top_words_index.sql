@@ -0,0 +1,7 @@
+-- Migration 006: Add composite index for per-session top words lookups
+-- Lets "top N words for a user in a session" queries (e.g. the LATERAL
+-- subquery used for session comparison) read the first N index entries
+-- instead of sorting every word_counts row for the session.
+
+CREATE INDEX IF NOT EXISTS idx_word_counts_session_user_count
+ON public.word_counts(session_id, user_id, count DESC);
@@ -170,7 +170,7 @@ class AudioChunk(Base):
     session_id = Column(UUID(as_uuid=True), ForeignKey("sessions.id", ondelete="CASCADE"), nullable=False)
     chunk_number = Column(Integer, nullable=False)
     storage_path = Column(Text, nullable=False)
-    duration_seconds = Column(DECIMAL(10, 2))
+    duration_seconds = Column(DECIMAL(10, 2, asdecimal=False))  # NUMERIC in DB, float in Python
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
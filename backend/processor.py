@@ -32,13 +32,14 @@ import logging
 import asyncio
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
-from collections import defaultdict
+from collections import Counter, defaultdict
 from decimal import Decimal
 
 import httpx
 import numpy as np
 import soundfile as sf
 from pydub import AudioSegment
+from sqlalchemy import insert
 from sqlalchemy.orm import Session as DBSession
 
 from database import SessionLocal
@@ -52,9 +53,8 @@ from services.diarization import (
     SpeakerSegment,
 )
 from services.transcription import (
-    transcribe_audio,
-    apply_corrections,
-    count_target_words,
+    transcribe_segments,
+    process_transcription,
     SAMPLE_RATE,
 )
 # NOTE: Cache functions not used for word counting (chunk text contains mixed speakers)
@@ -71,6 +71,9 @@ PROGRESS_STAGES = {
     "generating_samples": (95, 100),
 }
 
+# Speaker segments sent to the transcription API per request
+TRANSCRIBE_BATCH_SIZE = 8
+
 
 class ProcessingError(Exception):
     """Custom exception for processing failures"""
@@ -366,57 +369,74 @@ async def transcribe_and_count(
     # Start transcription progress at 0
     update_progress(db, session, "transcribing", 0)
 
-    # Transcribe uncached segments in parallel
+    # Transcribe uncached segments in parallel, several segments per request
     if uncached_segments:
-        async def transcribe_segment(segment: SpeakerSegment) -> Tuple[str, Dict[str, int]]:
-            """Transcribe a single segment and return (speaker_id, word_counts)."""
+        async def transcribe_batch(batch: List[SpeakerSegment]) -> List[Tuple[str, Dict[str, int]]]:
+            """Transcribe a batch of segments and return (speaker_id, word_counts) for each."""
             try:
-                segment_bytes = extract_speaker_segment(
-                    audio_path, segment.start_time, segment.end_time
-                )
+                # Already 16kHz mono WAV (audio_path is the concatenated export),
+                # so the bytes go straight to the API without a temp file
+                batch_bytes = [
+                    extract_speaker_segment(audio_path, segment.start_time, segment.end_time)
+                    for segment in batch
+                ]
 
-                temp_segment = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
-                temp_segment.write(segment_bytes)
-                temp_segment.close()
-
-                try:
-                    # Run synchronous transcription in thread pool
-                    raw_text = await asyncio.to_thread(transcribe_audio, temp_segment.name)
-                    corrected = apply_corrections(raw_text)
-                    word_counts = count_target_words(corrected)
-                    return (segment.speaker_id, word_counts)
-                finally:
-                    os.remove(temp_segment.name)
+                # Run synchronous transcription in thread pool
+                raw_texts = await asyncio.to_thread(transcribe_segments, batch_bytes)
 
             except Exception as e:
-                logger.warning(f"Failed to transcribe segment ({segment.speaker_id}): {e}")
-                return (segment.speaker_id, {})
+                if len(batch) == 1:
+                    logger.warning(f"Failed to transcribe segment ({batch[0].speaker_id}): {e}")
+                    return [(batch[0].speaker_id, {})]
+
+                # Retry one segment per request so a bad segment only loses
+                # its own counts, not those of the whole batch
+                logger.warning(
+                    f"Failed to transcribe batch of {len(batch)} segments, "
+                    f"retrying one at a time: {e}"
+                )
+                results = []
+                for segment in batch:
+                    results.extend(await transcribe_batch([segment]))
+                return results
 
-        # Run transcriptions in parallel (limit concurrency to avoid OOM)
-        semaphore = asyncio.Semaphore(3)  # Max 3 concurrent transcriptions
+            return [
+                (segment.speaker_id, process_transcription(raw_text)[1])
+                for segment, raw_text in zip(batch, raw_texts)
+            ]
 
-        async def limited_transcribe(segment):
+        batches = [
+            uncached_segments[i:i + TRANSCRIBE_BATCH_SIZE]
+            for i in range(0, len(uncached_segments), TRANSCRIBE_BATCH_SIZE)
+        ]
+
+        # Run batches in parallel (limit concurrency to avoid OOM)
+        semaphore = asyncio.Semaphore(3)  # Max 3 concurrent batch requests
+
+        async def limited_transcribe(batch):
             async with semaphore:
-                return await transcribe_segment(segment)
+                return await transcribe_batch(batch)
 
         # Execute in parallel
         results = await asyncio.gather(
-            *[limited_transcribe(seg) for seg in uncached_segments],
+            *[limited_transcribe(batch) for batch in batches],
             return_exceptions=True
         )
 
         # Aggregate results
-        for i, result in enumerate(results):
+        done = 0
+        for batch, result in zip(batches, results):
+            done += len(batch)
             if isinstance(result, Exception):
                 logger.warning(f"Parallel transcription error: {result}")
                 continue
 
-            speaker_id, word_counts = result
-            for word, count in word_counts.items():
-                speaker_word_counts[speaker_id][word] += count
+            for speaker_id, word_counts in result:
+                for word, count in word_counts.items():
+                    speaker_word_counts[speaker_id][word] += count
 
             # Update progress
-            progress = (i + 1) * 100 // total_segments
+            progress = done * 100 // total_segments
             update_progress(db, session, "transcribing", progress)
 
     update_progress(db, session, "transcribing", 100)
@@ -455,40 +475,40 @@ def save_speaker_results(
     
     logger.info(f"Creating speaker records for {len(all_speaker_ids)} speakers: {all_speaker_ids}")
 
+    # Segments per speaker in one pass instead of rescanning per speaker
+    segment_counts = Counter(s.speaker_id for s in segments or ())
+
+    word_count_rows = []
     for speaker_id in all_speaker_ids:
         word_counts = speaker_results.get(speaker_id, {})
+        segment_count = segment_counts[speaker_id]
         
-        # Count segments for this speaker
-        segment_count = 0
-        if segments:
-            segment_count = sum(1 for s in segments if s.speaker_id == speaker_id)
-        
-        # Create SessionSpeaker record
+        # Create SessionSpeaker record (ID assigned here, no flush needed)
         speaker = SessionSpeaker(
             id=uuid.uuid4(),
             session_id=session_id,
             speaker_label=speaker_id,
             segment_count=segment_count if segment_count > 0 else sum(word_counts.values()),
         )
-        db.add(speaker)
-        db.flush()  # Get the ID
-
-        # Create SpeakerWordCount records
-        for word, count in word_counts.items():
-            word_count = SpeakerWordCount(
-                session_speaker_id=speaker.id,
-                word=word,
-                count=count
-            )
-            db.add(word_count)
-
         speaker_records[speaker_id] = speaker
 
+        word_count_rows.extend(
+            {"session_speaker_id": speaker.id, "word": word, "count": count}
+            for word, count in word_counts.items()
+        )
+
         logger.info(
             f"Saved speaker {speaker_id}: "
             f"{sum(word_counts.values())} total words"
         )
 
+    # All speakers in one flush, then every SpeakerWordCount row as a single
+    # executemany INSERT, all in the same transaction
+    db.add_all(speaker_records.values())
+    db.flush()
+    if word_count_rows:
+        db.execute(insert(SpeakerWordCount), word_count_rows)
+
     db.commit()
     return speaker_records
 
@@ -27,10 +27,13 @@ USAGE:
 """
 
 import logging
+import socket
 from typing import Optional
 
 import redis
+from redis.backoff import ExponentialBackoff
 from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.retry import Retry
 
 from config import settings
 
@@ -44,6 +47,61 @@ logger = logging.getLogger(__name__)
 PROCESSING_QUEUE = "lahstats:processing"
 FAILED_QUEUE = "lahstats:failed"
 
+# ============================================================================
+# CONNECTION SETTINGS
+# ============================================================================
+
+# TCP keepalive probes: idle 60s, then every 10s, give up after 3 misses.
+# Drops half-open connections (e.g. a worker idling in BRPOP behind a NAT)
+# in ~90s instead of on the next command. Only set where the OS has them
+KEEPALIVE_OPTIONS = {
+    getattr(socket, name): value
+    for name, value in (("TCP_KEEPIDLE", 60), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3))
+    if hasattr(socket, name)
+}
+
+
+def create_redis_client(
+    max_connections: int = 50,
+    decode_responses: bool = True,
+    socket_timeout: Optional[float] = None,
+) -> redis.Redis:
+    """
+    Create a pooled Redis client with keepalive, health checks and retries.
+    
+    Uses a BlockingConnectionPool, so callers wait for a free connection
+    instead of failing when all `max_connections` are in use. Commands that
+    hit a connection error or timeout are retried with exponential backoff
+    on a fresh connection before the error is raised.
+    
+    Args:
+        max_connections: Pool size
+        decode_responses: Decode replies to str (False returns raw bytes)
+        socket_timeout: Seconds to wait on a reply before treating the
+            connection as dead (None waits forever). Must exceed the timeout
+            of any blocking command sent on the client
+        
+    Returns:
+        Redis client (not yet connected)
+    """
+    pool = redis.BlockingConnectionPool.from_url(
+        settings.REDIS_URL,
+        max_connections=max_connections,
+        decode_responses=decode_responses,
+        socket_connect_timeout=5,  # 5 second connection timeout
+        socket_timeout=socket_timeout,
+        socket_keepalive=True,  # Keep connection alive
+        socket_keepalive_options=KEEPALIVE_OPTIONS,
+        health_check_interval=30,  # Check connection health every 30s
+        retry_on_timeout=True,  # Retry if timeout occurs
+        retry=Retry(ExponentialBackoff(), 3),
+    )
+    client = redis.Redis(connection_pool=pool)
+    # Own the pool like redis.from_url() does, so close() releases it too
+    client.auto_close_connection_pool = True
+    return client
+
+
 # ============================================================================
 # REDIS CLIENT SINGLETON
 # ============================================================================
@@ -91,15 +149,7 @@ def get_redis_client() -> redis.Redis:
     logger.debug(f"Connecting to Redis: {settings.REDIS_URL}")
     
     try:
-        _redis_client = redis.from_url(
-            settings.REDIS_URL,
-            decode_responses=True,  # Auto-decode bytes to strings
-            socket_connect_timeout=5,  # 5 second connection timeout
-            socket_keepalive=True,  # Keep connection alive
-            health_check_interval=30,  # Check connection health every 30s
-            retry_on_timeout=True,  # Retry if timeout occurs
-            max_connections=50  # Connection pool size
-        )
+        _redis_client = create_redis_client()  # Auto-decode bytes to strings
         
         # Test connection
         _redis_client.ping()
@@ -379,15 +379,16 @@ def _diarize_via_local_model(audio_path: str, min_segment_duration: float = 0.5)
 
     # Preload audio with soundfile to bypass torchcodec requirement on Windows
     # pyannote 4.x accepts {'waveform': tensor, 'sample_rate': int} format
-    audio_data, sample_rate = sf.read(audio_path)
+    # Decode straight to float32 so the tensor below shares the buffer
+    audio_data, sample_rate = sf.read(audio_path, dtype="float32")
+
+    # Multi-channel - downmix in one vectorized pass (pyannote averages the
+    # channels anyway) instead of copying a transposed (channels, samples) array
+    if audio_data.ndim == 2:
+        audio_data = audio_data.mean(axis=1, dtype=np.float32)
 
     # Convert to torch tensor: (channels, samples) format
-    if audio_data.ndim == 1:
-        # Mono audio - add channel dimension
-        waveform = torch.from_numpy(audio_data).float().unsqueeze(0)
-    else:
-        # Multi-channel - transpose to (channels, samples)
-        waveform = torch.from_numpy(audio_data.T).float()
+    waveform = torch.from_numpy(audio_data).unsqueeze(0)
 
     # Create audio input dict for pyannote
     audio_input = {"waveform": waveform, "sample_rate": sample_rate}
@@ -499,21 +500,24 @@ def extract_speaker_segment(
     if end_time <= start_time:
         raise ValueError("end_time must be greater than start_time")
 
-    # Read audio file
-    audio_data, sample_rate = sf.read(audio_path)
+    # Read the header only; the full recording is never decoded per segment
+    info = sf.info(audio_path)
+    sample_rate = info.samplerate
 
     # Convert time to sample indices
     start_sample = int(start_time * sample_rate)
     end_sample = int(end_time * sample_rate)
 
     # Clamp to valid range
-    end_sample = min(end_sample, len(audio_data))
+    end_sample = min(end_sample, info.frames)
 
-    if start_sample >= len(audio_data):
+    if start_sample >= info.frames:
         raise ValueError(f"start_time {start_time}s exceeds audio duration")
 
-    # Extract segment
-    segment_data = audio_data[start_sample:end_sample]
+    # Decode just the requested frames as float32
+    segment_data, _ = sf.read(
+        audio_path, start=start_sample, stop=end_sample, dtype="float32"
+    )
 
     # Write to bytes buffer or file
     import io
@@ -12,11 +12,24 @@ SETUP:
 import os
 import re
 import io
-import base64
+import atexit
+import shutil
 import logging
-from typing import Dict, Optional, Tuple
+import subprocess
+import time
+import wave
+from collections import Counter
+from functools import cache, lru_cache
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
 
 import httpx
+import numpy as np
+import soundfile as sf
+
+try:
+    import soxr
+except ImportError:
+    soxr = None
 
 logger = logging.getLogger(__name__)
 
@@ -26,13 +39,39 @@ logger = logging.getLogger(__name__)
 
 SAMPLE_RATE = 16000  # Expected input sample rate for audio conversion
 
+# Resolved once; when present, containers libsndfile can't read (m4a, mp3)
+# are decoded, downmixed and resampled by a single ffmpeg call
+_FFMPEG = shutil.which("ffmpeg")
+
+# One pooled client for all API calls so segments sent back to back reuse
+# the same connection instead of a new TCP/TLS handshake each. Generous
+# read timeout because model inference can be slow
+_HTTP = httpx.Client(
+    timeout=httpx.Timeout(120.0, connect=10.0),
+    limits=httpx.Limits(max_connections=16, max_keepalive_connections=8),
+)
+atexit.register(_HTTP.close)
+
+# Werkzeug's 404 text, i.e. the notebook server is up but was started before
+# /transcribe_batch existed. Any other 404 (ngrok's ERR_NGROK_3200 page for an
+# offline tunnel) is an ordinary failure and must not disable the endpoint
+_ROUTE_NOT_FOUND = "The requested URL was not found on the server"
+
+# After the server reports no batch route, segments go one at a time for this
+# long before /transcribe_batch is probed again (the notebook may be restarted)
+BATCH_ENDPOINT_RETRY_SECONDS = 300.0
+
+# time.monotonic() until which /transcribe_batch is skipped
+_batch_endpoint_retry_at = 0.0
+
 
 # =============================================================================
 # EXTERNAL API TRANSCRIPTION (Colab notebook)
 # =============================================================================
 
+@cache
 def _get_transcription_api_url() -> Optional[str]:
-    """Get external transcription API URL from config."""
+    """Get external transcription API URL from config (read once, see reload_config)."""
     try:
         from config import settings
         return settings.TRANSCRIPTION_API_URL
@@ -40,22 +79,111 @@ def _get_transcription_api_url() -> Optional[str]:
         return os.getenv("TRANSCRIPTION_API_URL")
 
 
+def reload_config() -> None:
+    """Forget the cached API URL so the next call re-reads config/env."""
+    _get_transcription_api_url.cache_clear()
+
+
 def is_using_external_api() -> bool:
     """Check if external transcription API is configured."""
     url = _get_transcription_api_url()
     return url is not None and len(url) > 0
 
 
-def _convert_to_wav(audio_path: str) -> bytes:
+def _resample(audio: np.ndarray, orig_sr: int) -> np.ndarray:
+    """Resample float32 audio to SAMPLE_RATE (soxr, else scipy polyphase)."""
+    if orig_sr == SAMPLE_RATE:
+        return audio
+    if soxr is not None:
+        return soxr.resample(audio, orig_sr, SAMPLE_RATE, quality="HQ")
+
+    from math import gcd
+    from scipy.signal import resample_poly
+
+    g = gcd(orig_sr, SAMPLE_RATE)
+    return resample_poly(audio, SAMPLE_RATE // g, orig_sr // g).astype(np.float32)
+
+
+def _is_target_wav(info) -> bool:
+    """True if sf.info() describes 16kHz mono PCM_16 WAV, which the API takes as-is."""
+    return (info.format, info.subtype, info.samplerate, info.channels) == (
+        "WAV", "PCM_16", SAMPLE_RATE, 1
+    )
+
+
+def _post_audio(endpoint: str, audio) -> httpx.Response:
     """
-    Convert audio file to WAV format (16kHz mono) for API compatibility.
+    POST one clip to the API as a multipart file upload.
 
-    Args:
-        audio_path: Path to audio file (any format supported by pydub/ffmpeg)
+    Multipart avoids the 4/3 size overhead and the extra copy of base64 JSON,
+    and a file object passed as `audio` is streamed from disk in chunks.
+    """
+    return _HTTP.post(endpoint, files={"audio": ("audio.wav", audio, "audio/wav")})
 
-    Returns:
-        WAV audio bytes
+
+def _ffmpeg_to_wav(audio_path: str) -> bytes:
+    """Decode any container to 16kHz mono PCM_16 WAV bytes with one ffmpeg call."""
+    # Raw s16le on stdout, wrapped below: a WAV written to a pipe has no
+    # real sizes in its header because ffmpeg can't seek back to fix them
+    pcm = subprocess.run(
+        [_FFMPEG, "-nostdin", "-loglevel", "error", "-i", audio_path,
+         "-ac", "1", "-ar", str(SAMPLE_RATE), "-f", "s16le", "-"],
+        capture_output=True,
+        check=True,
+    ).stdout
+
+    wav_buffer = io.BytesIO()
+    with wave.open(wav_buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(pcm)
+    return wav_buffer.getvalue()
+
+
+def _open_wav(audio_path: str) -> Union[BinaryIO, bytes]:
     """
+    Get audio file as 16kHz mono WAV for the API, probing its format once.
+
+    Files that are already 16kHz mono PCM_16 WAV (e.g. extracted speaker
+    segments) come back as an open binary file for the caller to stream and
+    close; anything else is converted by _encode_wav() and returned as bytes.
+    """
+    try:
+        info = sf.info(audio_path)
+    except RuntimeError:  # sf.LibsndfileError: container not supported
+        info = None
+
+    if info is not None and _is_target_wav(info):
+        return open(audio_path, "rb")
+    return _encode_wav(audio_path, info)
+
+
+def _encode_wav(audio_path: str, info) -> bytes:
+    """
+    Re-encode audio file as 16kHz mono PCM_16 WAV bytes.
+
+    Formats libsndfile can read (wav, flac, ogg; `info` is their sf.info())
+    are decoded in-process and resampled with soxr; anything else (m4a,
+    mp3, ...; `info` is None) is piped through ffmpeg directly, or pydub
+    when the ffmpeg binary isn't on PATH.
+    """
+    audio = None
+    if info is not None:
+        audio, sr = sf.read(audio_path, dtype="float32")
+
+    if audio is not None:
+        if audio.ndim == 2:
+            audio = audio.mean(axis=1, dtype=np.float32)
+        audio = _resample(audio, sr)
+
+        wav_buffer = io.BytesIO()
+        sf.write(wav_buffer, audio, SAMPLE_RATE, subtype="PCM_16", format="WAV")
+        return wav_buffer.getvalue()
+
+    if _FFMPEG is not None:
+        return _ffmpeg_to_wav(audio_path)
+
     from pydub import AudioSegment
 
     # Load audio (pydub handles m4a, mp3, wav, etc.)
@@ -72,6 +200,25 @@ def _convert_to_wav(audio_path: str) -> bytes:
     return wav_buffer.read()
 
 
+def _convert_to_wav(audio_path: str) -> bytes:
+    """
+    Convert audio file to WAV format (16kHz mono) for API compatibility.
+
+    Files already in that format are returned as-is, see _open_wav().
+
+    Args:
+        audio_path: Path to audio file (any format supported by pydub/ffmpeg)
+
+    Returns:
+        WAV audio bytes
+    """
+    audio = _open_wav(audio_path)
+    if isinstance(audio, bytes):
+        return audio
+    with audio:
+        return audio.read()
+
+
 def transcribe_audio(audio_path: str) -> str:
     """
     Transcribe audio file to text using external MERaLiON API.
@@ -101,17 +248,15 @@ def transcribe_audio(audio_path: str) -> str:
     logger.info(f"Transcribing audio via external API: {audio_path}")
 
     try:
-        # Convert to WAV format (handles m4a, mp3, etc.)
-        audio_bytes = _convert_to_wav(audio_path)
-        audio_b64 = base64.b64encode(audio_bytes).decode("utf-8")
-
-        # Call API with generous timeout (model inference can be slow)
-        with httpx.Client(timeout=120.0) as client:
-            response = client.post(
-                transcribe_endpoint,
-                json={"audio": audio_b64},
-                headers={"Content-Type": "application/json"}
-            )
+        # Call API on the shared pooled client (model inference can be slow).
+        # Files already in the target format are streamed straight from disk,
+        # anything else is converted first (handles m4a, mp3, etc.)
+        audio = _open_wav(audio_path)
+        if isinstance(audio, bytes):
+            response = _post_audio(transcribe_endpoint, audio)
+        else:
+            with audio:
+                response = _post_audio(transcribe_endpoint, audio)
 
         if response.status_code != 200:
             error_msg = response.text[:500] if response.text else "Unknown error"
@@ -157,14 +302,7 @@ def transcribe_segment(audio_bytes: bytes, sample_rate: int = SAMPLE_RATE) -> st
     transcribe_endpoint = f"{api_url.rstrip('/')}/transcribe"
 
     try:
-        audio_b64 = base64.b64encode(audio_bytes).decode("utf-8")
-
-        with httpx.Client(timeout=120.0) as client:
-            response = client.post(
-                transcribe_endpoint,
-                json={"audio": audio_b64},
-                headers={"Content-Type": "application/json"}
-            )
+        response = _post_audio(transcribe_endpoint, audio_bytes)
 
         if response.status_code != 200:
             error_msg = response.text[:500] if response.text else "Unknown error"
@@ -177,6 +315,88 @@ def transcribe_segment(audio_bytes: bytes, sample_rate: int = SAMPLE_RATE) -> st
         raise RuntimeError(f"External transcription failed: {e}")
 
 
+def _transcribe_each(segments: List[bytes]) -> List[str]:
+    """One transcribe_segment() call per segment; a segment that fails comes back as ""."""
+    transcriptions = []
+    for i, audio_bytes in enumerate(segments, 1):
+        try:
+            transcriptions.append(transcribe_segment(audio_bytes))
+        except RuntimeError as e:
+            logger.warning(f"Failed to transcribe segment {i}/{len(segments)}: {e}")
+            transcriptions.append("")
+    return transcriptions
+
+
+def transcribe_segments(segments: List[bytes]) -> List[str]:
+    """
+    Transcribe several audio segments in one request to the external API.
+
+    The server runs them through the model as one batch. Falls back to one
+    transcribe_segment() call per segment while the server has no batch
+    endpoint (re-checked every BATCH_ENDPOINT_RETRY_SECONDS); in that mode a
+    segment that fails is returned as "" so it can't take the rest of the
+    batch with it.
+
+    Args:
+        segments: Raw audio data for each segment (WAV format)
+
+    Returns:
+        Raw transcription text for each segment, in input order
+
+    Raises:
+        RuntimeError: If transcription fails or API not configured
+    """
+    global _batch_endpoint_retry_at
+
+    if not segments:
+        return []
+
+    api_url = _get_transcription_api_url()
+    if not api_url:
+        raise RuntimeError(
+            "TRANSCRIPTION_API_URL not configured. "
+            "Set this environment variable to your Colab ngrok URL."
+        )
+
+    if time.monotonic() < _batch_endpoint_retry_at:
+        return _transcribe_each(segments)
+
+    transcribe_endpoint = f"{api_url.rstrip('/')}/transcribe_batch"
+
+    try:
+        # One repeated "audios" multipart field per clip, in order. Inference
+        # time grows with batch size, so scale the read timeout
+        response = _HTTP.post(
+            transcribe_endpoint,
+            files=[
+                ("audios", (f"segment_{i}.wav", audio_bytes, "audio/wav"))
+                for i, audio_bytes in enumerate(segments)
+            ],
+            timeout=httpx.Timeout(120.0 * len(segments), connect=10.0),
+        )
+    except httpx.HTTPError as e:
+        raise RuntimeError(f"External transcription failed: {e}")
+
+    if response.status_code == 404 and _ROUTE_NOT_FOUND in response.text:
+        logger.info(
+            "Transcription API has no batch endpoint, sending segments one at a time "
+            f"for the next {BATCH_ENDPOINT_RETRY_SECONDS:.0f}s"
+        )
+        _batch_endpoint_retry_at = time.monotonic() + BATCH_ENDPOINT_RETRY_SECONDS
+        return _transcribe_each(segments)
+
+    if response.status_code != 200:
+        error_msg = response.text[:500] if response.text else "Unknown error"
+        raise RuntimeError(f"API returned {response.status_code}: {error_msg}")
+
+    transcriptions = response.json().get("transcriptions", [])
+    if len(transcriptions) != len(segments):
+        raise RuntimeError(
+            f"API returned {len(transcriptions)} transcriptions for {len(segments)} segments"
+        )
+    return transcriptions
+
+
 # =============================================================================
 # SINGLISH POST-PROCESSING CORRECTIONS
 # =============================================================================
@@ -351,15 +571,85 @@ TARGET_WORDS = [
     'atas', 'kaypoh', 'steady', 'power', 'liao',
 ]
 
+def _trie_pattern(keys) -> str:
+    """
+    Build a regex that matches any of `keys`, factored as a prefix trie.
+
+    A flat "a|b|c" alternation makes `re` retry every key at every position.
+    Nesting the keys by shared prefix means each character is tested once
+    per trie level, so matching behaves close to a DFA. Optional tails are
+    greedy, so the longest key that fits is still tried first.
+    """
+    trie: Dict[str, dict] = {}
+    for key in keys:
+        node = trie
+        for ch in key:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # end-of-key marker
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" not in node:
+            return body
+        return body + "?" if len(branches) > 1 else "(?:" + body + ")?"
+
+    return build(trie)
+
+
+def _compile_alternation(table: Dict[str, str]) -> "re.Pattern[str]":
+    """Compile dict keys into one word-bounded regex, longest keys first."""
+    return re.compile(r'\b(' + _trie_pattern(table) + r')\b', re.IGNORECASE)
+
+
+# Both tables merged and precompiled so apply_corrections scans the text
+# once. Longest keys are tried first, so multi-word phrases still win
+# over the single words they start with. Keys are lowercased here because
+# matches are looked up by their lowercased text
+_ALL_CORRECTIONS = {k.lower(): v for k, v in {**CORRECTIONS, **WORD_CORRECTIONS}.items()}
+_CORRECTIONS_RE = _compile_alternation(_ALL_CORRECTIONS)
+
+# The same table keyed by the casings ASR output actually uses, so most
+# matches resolve with one lookup and no .lower() allocation
+_CORRECTIONS_BY_CASE = {
+    variant: value
+    for key, value in _ALL_CORRECTIONS.items()
+    for variant in (key, key.upper(), key.title(), key.capitalize())
+}
+
+
+def _replace_correction(match: "re.Match[str]") -> str:
+    word = match[1]
+    return _CORRECTIONS_BY_CASE.get(word) or _ALL_CORRECTIONS[word.lower()]
+
+# Target vocabulary as a frozenset for O(1) token membership checks.
+# At ~60 words this is smaller and faster than a trie (e.g. marisa-trie);
+# revisit only if the list grows into the hundreds
+_TARGET_SET = frozenset(w.lower() for w in TARGET_WORDS)
+
+# Maximal runs of ASCII letters. A target only counts when it is a whole
+# run, which is the same rule as "no letter on either side" used for matching.
+# Only ever applied to lowercased text, so no IGNORECASE (which is slower and
+# also lets non-ASCII letters like "ı" and "ſ" match [a-z])
+_TOKEN_RE = re.compile(r'[a-z]+')
+
+
+# Annotation markers stripped before matching: !(word)! and (word)
+_UNCERTAIN_RE = re.compile(r'!\(([^)]+)\)!')
+_FILLER_RE = re.compile(r'\(([a-zA-Z]+)\)')
+_WHITESPACE_RE = re.compile(r'\s+')
+
 
 def _normalize_for_matching(text: str) -> str:
     """Normalize text before correction matching."""
     if not text:
         return text
     result = text
-    result = re.sub(r'!\(([^)]+)\)!', r'\1', result)
-    result = re.sub(r'\(([a-zA-Z]+)\)', r'\1', result)
-    result = re.sub(r'\s+', ' ', result)
+    result = _UNCERTAIN_RE.sub(r'\1', result)
+    result = _FILLER_RE.sub(r'\1', result)
+    result = _WHITESPACE_RE.sub(' ', result)
     return result.strip()
 
 
@@ -369,19 +659,7 @@ def apply_corrections(text: str) -> str:
         return text
 
     result = _normalize_for_matching(text)
-
-    # Apply multi-word corrections first (longer phrases first)
-    sorted_corrections = sorted(CORRECTIONS.items(), key=lambda x: len(x[0]), reverse=True)
-    for wrong, correct in sorted_corrections:
-        pattern = re.compile(re.escape(wrong), re.IGNORECASE)
-        result = pattern.sub(correct, result)
-
-    # Apply single-word corrections with word boundary checking
-    for wrong, correct in WORD_CORRECTIONS.items():
-        pattern = re.compile(r'\b' + re.escape(wrong) + r'\b', re.IGNORECASE)
-        result = pattern.sub(correct, result)
-
-    return result
+    return _CORRECTIONS_RE.sub(_replace_correction, result)
 
 
 def count_target_words(text: str) -> Dict[str, int]:
@@ -390,19 +668,23 @@ def count_target_words(text: str) -> Dict[str, int]:
         return {}
 
     normalized = _normalize_for_matching(text.lower())
-    counts: Dict[str, int] = {}
+    tokens = Counter(_TOKEN_RE.findall(normalized))
+    return {word: count for word, count in tokens.items() if word in _TARGET_SET}
 
-    for word in TARGET_WORDS:
-        pattern = re.compile(r'(?<![a-zA-Z])' + re.escape(word) + r'(?![a-zA-Z])', re.IGNORECASE)
-        matches = pattern.findall(normalized)
-        if matches:
-            counts[word] = len(matches)
 
-    return counts
+@lru_cache(maxsize=4096)
+def _process_cached(text: str) -> Tuple[str, Tuple[Tuple[str, int], ...]]:
+    corrected = apply_corrections(text)
+    return corrected, tuple(count_target_words(corrected).items())
 
 
 def process_transcription(text: str) -> Tuple[str, Dict[str, int]]:
-    """Apply corrections and count words in one step."""
-    corrected = apply_corrections(text)
-    counts = count_target_words(corrected)
-    return corrected, counts
+    """
+    Apply corrections and count words in one step.
+
+    Results are memoized per input text, since diarized segments often
+    repeat short utterances ("lah", "ok can"). Counts are cached as a tuple
+    and a fresh dict is returned, so callers may mutate it.
+    """
+    corrected, counts = _process_cached(text)
+    return corrected, dict(counts)
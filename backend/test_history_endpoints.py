@@ -21,6 +21,7 @@ import os
 import sys
 from datetime import datetime, timedelta
 import uuid
+from collections import defaultdict
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -82,7 +83,9 @@ async def test_session_list(db: Session):
     ).order_by(SessionModel.started_at.desc()).limit(20).all()
     
     print_info(f"\n📋 Found {len(sessions)} sessions")
-    
+
+    # Render all rows into one buffer and write once instead of 8 prints per row
+    lines = []
     for i, session in enumerate(sessions, 1):
         # Get starter name
         starter = db.query(Profile).filter(Profile.id == session.started_by).first()
@@ -104,15 +107,21 @@ async def test_session_list(db: Session):
             WordCount.session_id == session.id
         ).scalar() or 0
         
-        print(f"\n  {i}. Session {session.id}")
-        print(f"     Started by: {starter.display_name if starter else 'Unknown'}")
-        print(f"     Status: {session.status}")
-        print(f"     Started: {session.started_at}")
-        print(f"     Duration: {session.duration_seconds}s" if session.duration_seconds else "     (In progress)")
-        print(f"     Speakers: {speakers}")
-        print(f"     My words: {my_words}")
-        print(f"     Group words: {group_words}")
-    
+        duration = f"     Duration: {session.duration_seconds}s" if session.duration_seconds else "     (In progress)"
+        lines.append(
+            f"\n  {i}. Session {session.id}\n"
+            f"     Started by: {starter.display_name if starter else 'Unknown'}\n"
+            f"     Status: {session.status}\n"
+            f"     Started: {session.started_at}\n"
+            f"{duration}\n"
+            f"     Speakers: {speakers}\n"
+            f"     My words: {my_words}\n"
+            f"     Group words: {group_words}"
+        )
+
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+
     print_success(f"\n✅ Session list endpoint working! Found {len(sessions)} sessions")
 
 
@@ -190,23 +199,45 @@ async def test_session_comparison(db: Session):
     
     total_across_all = 0
     target_words = {tw.word: tw.emoji for tw in db.query(TargetWord).all()}
-    
+    params = {"ids": [str(s.id) for s in sessions], "u": str(user.id)}
+
+    # Totals and top 3 for every session in two round trips instead of one
+    # query per session (top 3 is served by idx_word_counts_session_user_count
+    # and arrives already ordered by count DESC)
+    totals = {
+        str(row.session_id): row
+        for row in db.execute(text("""
+            SELECT session_id, SUM(count) AS total, COUNT(DISTINCT word) AS unique_words
+            FROM word_counts
+            WHERE session_id = ANY(CAST(:ids AS uuid[])) AND user_id = :u
+            GROUP BY session_id
+        """), params)
+    }
+    top_words = defaultdict(list)
+    for row in db.execute(text("""
+        SELECT s.id, t.word, t.count
+        FROM unnest(CAST(:ids AS uuid[])) AS s(id)
+        JOIN LATERAL (
+            SELECT word, count FROM word_counts
+            WHERE session_id = s.id AND user_id = :u
+            ORDER BY count DESC
+            LIMIT 3
+        ) t ON true
+    """), params):
+        top_words[str(row.id)].append(row)
+
     for i, session in enumerate(sessions, 1):
-        word_counts = db.query(WordCount).filter(
-            WordCount.session_id == session.id,
-            WordCount.user_id == user.id
-        ).all()
-        
-        total = sum(wc.count for wc in word_counts)
-        unique = len(set(wc.word for wc in word_counts))
+        row = totals.get(str(session.id))
+        total = row.total if row else 0
+        unique = row.unique_words if row else 0
         total_across_all += total
-        
+
         print(f"\n  Session {i}: {session.started_at}")
         print(f"     Total words: {total}")
         print(f"     Unique words: {unique}")
         print(f"     Top 3:")
-        
-        for wc in sorted(word_counts, key=lambda x: x.count, reverse=True)[:3]:
+
+        for wc in top_words[str(session.id)]:
             emoji = target_words.get(wc.word, "")
             print(f"       {emoji} {wc.word}: {wc.count}")
     
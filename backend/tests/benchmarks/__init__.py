@@ -0,0 +1,7 @@
+"""
+tests/benchmarks/__init__.py - Microbenchmark Package
+
+PURPOSE:
+    Benchmarks for the word-counting hot paths, run with `pytest -m bench`.
+    Deselected from the default test run by pytest.ini.
+"""
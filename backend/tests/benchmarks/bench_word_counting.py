@@ -0,0 +1,53 @@
+"""
+tests/benchmarks/bench_word_counting.py - Word Counting Microbenchmarks
+
+PURPOSE:
+    Pin the speed of apply_corrections() and count_target_words() on a
+    realistic transcript so matcher rewrites get a before/after number.
+
+USAGE:
+    pytest -m bench tests/benchmarks
+"""
+
+import random
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from services.transcription import (
+    CORRECTIONS,
+    TARGET_WORDS,
+    apply_corrections,
+    count_target_words,
+)
+
+pytestmark = pytest.mark.bench
+
+# Everyday English filler that makes up most of a real transcript
+COMMON_ENGLISH = (
+    "the", "a", "and", "to", "of", "i", "you", "it", "is", "that", "we", "was",
+    "for", "on", "so", "but", "this", "with", "have", "go", "later", "eat",
+    "already", "really", "very", "then", "what", "time", "meeting", "today",
+)
+
+
+@pytest.fixture(scope="module")
+def transcript():
+    """~10k tokens, about 1 in 100 a target word or known misrecognition."""
+    rng = random.Random(0)
+    singlish = list(TARGET_WORDS) + list(CORRECTIONS)
+    return " ".join(
+        rng.choice(singlish) if rng.random() < 0.01 else rng.choice(COMMON_ENGLISH)
+        for _ in range(10_000)
+    )
+
+
+def test_bench_apply_corrections(benchmark, transcript):
+    benchmark(apply_corrections, transcript)
+
+
+def test_bench_count_target_words(benchmark, transcript):
+    corrected = apply_corrections(transcript)
+    counts = benchmark(count_target_words, corrected)
+    assert counts
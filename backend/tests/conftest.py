@@ -5,12 +5,10 @@ Provides test database, mock services, and common test utilities.
 """
 
 import os
-import sys
 import uuid
 import pytest
 from datetime import datetime
 from unittest.mock import MagicMock, AsyncMock, patch
-from decimal import Decimal
 
 # Set test environment variables BEFORE importing config
 os.environ["SUPABASE_URL"] = "https://test-project.supabase.co"
@@ -20,10 +18,8 @@ os.environ["DATABASE_URL"] = "sqlite:///:memory:"
 os.environ["REDIS_URL"] = "redis://localhost:6379"
 os.environ["HUGGINGFACE_TOKEN"] = "test-hf-token"
 
-# Add backend to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from sqlalchemy import create_engine
+from sqlalchemy import BigInteger, create_engine
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -35,6 +31,12 @@ from models import Profile, Group, Session, SessionSpeaker, AudioChunk
 TEST_DATABASE_URL = "sqlite:///:memory:"
 
 
+@compiles(BigInteger, "sqlite")
+def _bigint_as_sqlite_integer(type_, compiler, **kw):
+    """SQLite only autoincrements INTEGER PRIMARY KEY, so map BIGSERIAL ids to it."""
+    return "INTEGER"
+
+
 @pytest.fixture(scope="function")
 def db_engine():
     """Create test database engine."""
@@ -113,7 +115,7 @@ def sample_chunks(db, sample_session):
             session_id=sample_session.id,
             chunk_number=i,
             storage_path=f"sessions/{sample_session.id}/chunk_{i}.wav",
-            duration_seconds=Decimal("10.0"),
+            duration_seconds=10.0,
         )
         db.add(chunk)
         chunks.append(chunk)
@@ -175,11 +177,24 @@ def mock_transcription():
         "Walao eh the traffic today really jialat sia",
     ]
 
-    with patch("processor.transcribe_audio") as mock:
-        mock.side_effect = transcriptions
+    # processor sends segments in batches; one batch covers all three here
+    with patch("processor.transcribe_segments") as mock:
+        mock.return_value = transcriptions
         yield mock, transcriptions
 
 
+@pytest.fixture
+def transcription(monkeypatch):
+    """services.transcription with its module-level state reset for one test."""
+    import services.transcription as module
+
+    # Restored by monkeypatch afterwards, so tests can't leak it to each other
+    monkeypatch.setattr(module, "_batch_endpoint_retry_at", 0.0)
+    module.reload_config()
+    yield module
+    module.reload_config()
+
+
 @pytest.fixture
 def mock_extract_segment():
     """Mock segment extraction."""
@@ -189,6 +204,14 @@ def mock_extract_segment():
         yield mock
 
 
+@pytest.fixture(scope="session")
+def fake_wav_path(tmp_path_factory):
+    """Path to a placeholder WAV file shared by the whole test session."""
+    path = tmp_path_factory.mktemp("audio") / "fake.wav"
+    path.write_bytes(b"RIFF" + b"\x00" * 100)
+    return str(path)
+
+
 # Sample transcription text with known Singlish words
 SAMPLE_TRANSCRIPTION = """
 Wah this mala damn shiok sia!
@@ -5,34 +5,56 @@ Tests the processing pipeline with mocked services to verify the flow works
 without requiring actual ML models or audio files.
 """
 
-import os
-import sys
 import uuid
 import pytest
-import tempfile
+from contextlib import ExitStack
 from unittest.mock import MagicMock, AsyncMock, patch
 from decimal import Decimal
 
-# Add backend to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models import Session, SessionSpeaker, SpeakerWordCount
+from processor import (
+    PROGRESS_STAGES,
+    run_diarization,
+    save_speaker_results,
+    transcribe_and_count,
+)
+from services.diarization import SpeakerSegment
+from services.transcription import (
+    apply_corrections,
+    count_target_words,
+    process_transcription,
+)
+
+
+_SEGMENT_TRANSCRIPTIONS = (
+    "Wah this one damn good lah",
+    "Cannot lor I got other things",
+    "Walao eh really jialat sia",
+)
+
+
+def _fake_public_url(path):
+    return f"https://storage.example.com/{path}"
+
+
+def _fake_upload_path(session_id, content, filename):
+    return f"sessions/{session_id}/{filename}"
 
 
 class TestTranscriptionFlow:
     """Test transcription and word counting flow (no database)."""
 
-    def test_apply_corrections_basic(self):
+    @pytest.mark.parametrize("text, expected_word", [
+        ("while up", "walao"),
+        ("wa lao", "walao"),
+        ("Just do it la", "lah"),
+    ])
+    def test_apply_corrections_basic(self, text, expected_word):
         """Test that corrections are applied to known misrecognitions."""
-        from services.transcription import apply_corrections
-
-        # Test known corrections
-        assert "walao" in apply_corrections("while up").lower()
-        assert "walao" in apply_corrections("wa lao").lower()
-        assert "lah" in apply_corrections("Just do it la").lower()
+        assert expected_word in apply_corrections(text).lower()
 
     def test_count_target_words(self):
         """Test word counting on known text."""
-        from services.transcription import count_target_words
-
         text = "Wah this one damn shiok lah! Cannot lor, very jialat sia."
         counts = count_target_words(text)
 
@@ -46,8 +68,6 @@ class TestTranscriptionFlow:
 
     def test_count_target_words_case_insensitive(self):
         """Test that counting is case insensitive."""
-        from services.transcription import count_target_words
-
         text = "WAH shiok SHIOK Shiok"
         counts = count_target_words(text)
 
@@ -56,8 +76,6 @@ class TestTranscriptionFlow:
 
     def test_process_transcription_combined(self):
         """Test combined correction and counting."""
-        from services.transcription import process_transcription
-
         # Text with misrecognitions
         text = "while up eh the traffic today really jialat"
         corrected, counts = process_transcription(text)
@@ -73,8 +91,6 @@ class TestDiarizationIntegration:
 
     def test_speaker_segment_dataclass(self):
         """Test SpeakerSegment creation."""
-        from services.diarization import SpeakerSegment
-
         segment = SpeakerSegment(
             speaker_id="SPEAKER_00",
             start_time=0.0,
@@ -92,8 +108,6 @@ class TestProcessorHelpers:
 
     def test_progress_calculation(self):
         """Test progress stage calculations."""
-        from processor import PROGRESS_STAGES
-
         # Verify stage weights add up correctly
         assert PROGRESS_STAGES["concatenating"] == (0, 10)
         assert PROGRESS_STAGES["diarizing"] == (10, 40)
@@ -105,100 +119,161 @@ class TestProcessorHelpers:
 class TestProcessorPipelineFlow:
     """Test the pipeline flow with mocked services."""
 
-    @pytest.fixture
-    def mock_all_services(self):
-        """Mock all external services for pipeline testing."""
-        from services.diarization import SpeakerSegment
-
+    @pytest.fixture(scope="class")
+    @classmethod
+    def mock_all_services(cls):
+        """Mock all external services once for the whole class."""
         mock_segments = [
             SpeakerSegment("SPEAKER_00", 0.0, 5.0),
             SpeakerSegment("SPEAKER_01", 5.5, 10.0),
             SpeakerSegment("SPEAKER_00", 10.5, 15.0),
         ]
 
-        patches = {
-            "diarize": patch("processor.diarize_audio", return_value=mock_segments),
-            "transcribe": patch(
-                "processor.transcribe_audio",
-                side_effect=[
-                    "Wah this one damn good lah",
-                    "Cannot lor I got other things",
-                    "Walao eh really jialat sia",
-                ],
-            ),
-            "extract": patch(
-                "processor.extract_speaker_segment",
-                return_value=b"RIFF" + b"\x00" * 100,
-            ),
-            "storage": patch("processor.storage"),
-        }
+        with ExitStack() as stack:
+            mocks = {
+                "diarize": stack.enter_context(
+                    patch("processor.diarize_audio", return_value=mock_segments)
+                ),
+                "transcribe": stack.enter_context(patch(
+                    "processor.transcribe_segments",
+                    return_value=list(_SEGMENT_TRANSCRIPTIONS),
+                )),
+                "extract": stack.enter_context(patch(
+                    "processor.extract_speaker_segment",
+                    return_value=b"RIFF" + b"\x00" * 100,
+                )),
+                "storage": stack.enter_context(patch("processor.storage")),
+            }
+            mocks["storage"].get_public_url = MagicMock(side_effect=_fake_public_url)
+            mocks["storage"].upload_processed_audio = AsyncMock(side_effect=_fake_upload_path)
+
+            yield mocks, mock_segments
+
+    @pytest.fixture(autouse=True)
+    def _reset_service_mocks(self, mock_all_services):
+        """Clear call history and restore the canned transcriptions per test."""
+        mocks, _ = mock_all_services
+        for mock in mocks.values():
+            mock.reset_mock()
+        mocks["transcribe"].return_value = list(_SEGMENT_TRANSCRIPTIONS)
+
+    def test_run_diarization_calls_service(self, mock_all_services, fake_wav_path):
+        """Test that run_diarization calls the diarization service."""
+        mocks, expected_segments = mock_all_services
 
-        started = {k: p.start() for k, p in patches.items()}
-        started["storage"].get_public_url = MagicMock(
-            side_effect=lambda p: f"https://storage.example.com/{p}"
-        )
-        started["storage"].upload_processed_audio = AsyncMock(
-            side_effect=lambda sid, content, fname: f"sessions/{sid}/{fname}"
-        )
+        segments = run_diarization(fake_wav_path)
 
-        yield started, mock_segments
+        assert len(segments) == 3
+        assert segments[0].speaker_id == "SPEAKER_00"
+        assert segments[1].speaker_id == "SPEAKER_01"
+        mocks["diarize"].assert_called_once_with(fake_wav_path)
 
-        for p in patches.values():
-            p.stop()
+    @pytest.mark.asyncio
+    async def test_transcribe_and_count_aggregates_per_speaker(
+        self, db, sample_session, mock_all_services, fake_wav_path
+    ):
+        """Test that transcribe_and_count aggregates words per speaker."""
+        mocks, mock_segments = mock_all_services
 
-    def test_run_diarization_calls_service(self, mock_all_services):
-        """Test that run_diarization calls the diarization service."""
-        from processor import run_diarization
+        # Refresh session in this db session
+        session = db.query(Session).filter(Session.id == sample_session.id).first()
 
-        mocks, expected_segments = mock_all_services
+        speaker_results = await transcribe_and_count(
+            fake_wav_path, mock_segments, db, session
+        )
 
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-            f.write(b"fake audio")
-            temp_path = f.name
+        # Should have 2 speakers
+        assert "SPEAKER_00" in speaker_results
+        assert "SPEAKER_01" in speaker_results
 
-        try:
-            segments = run_diarization(temp_path)
+        # SPEAKER_00 had 2 segments
+        speaker_00_counts = speaker_results["SPEAKER_00"]
+        assert "wah" in speaker_00_counts or "walao" in speaker_00_counts
 
-            assert len(segments) == 3
-            assert segments[0].speaker_id == "SPEAKER_00"
-            assert segments[1].speaker_id == "SPEAKER_01"
-            mocks["diarize"].assert_called_once_with(temp_path)
-        finally:
-            os.unlink(temp_path)
+
+class TestTranscribeBatches:
+    """Test batched segment transcription in transcribe_and_count."""
+
+    SEGMENTS = [
+        SpeakerSegment("SPEAKER_00", 0.0, 5.0),
+        SpeakerSegment("SPEAKER_01", 5.5, 10.0),
+        SpeakerSegment("SPEAKER_00", 10.5, 15.0),
+    ]
 
     @pytest.mark.asyncio
-    async def test_transcribe_and_count_aggregates_per_speaker(
-        self, db, sample_session, mock_all_services
+    async def test_sends_segments_in_one_batch(
+        self, db, sample_session, mock_transcription, mock_extract_segment, fake_wav_path
     ):
-        """Test that transcribe_and_count aggregates words per speaker."""
-        from processor import transcribe_and_count
+        """Test that all segments go out in one request and counts land per speaker."""
+        mock, _ = mock_transcription
 
-        mocks, mock_segments = mock_all_services
+        results = await transcribe_and_count(fake_wav_path, self.SEGMENTS, db, sample_session)
 
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-            f.write(b"fake audio")
-            temp_path = f.name
+        mock.assert_called_once()
+        assert len(mock.call_args.args[0]) == 3
+        assert results["SPEAKER_00"]["wah"] == 1
+        assert results["SPEAKER_00"]["walao"] == 1
+        assert results["SPEAKER_01"]["cannot"] == 1
 
-        try:
-            # Refresh session in this db session
-            from models import Session
+    @pytest.mark.asyncio
+    async def test_failed_batch_only_loses_bad_segment(
+        self, db, sample_session, mock_transcription, mock_extract_segment, fake_wav_path
+    ):
+        """Test that a failed batch is retried per segment, keeping the good ones."""
+        mock, _ = mock_transcription
+        mock.side_effect = [
+            RuntimeError("API returned 500"),  # whole batch
+            ["Wah shiok lah"],
+            RuntimeError("API returned 500"),  # SPEAKER_01's segment
+            ["Walao eh"],
+        ]
+
+        results = await transcribe_and_count(fake_wav_path, self.SEGMENTS, db, sample_session)
+
+        assert mock.call_count == 4
+        assert results["SPEAKER_00"] == {"wah": 1, "shiok": 1, "lah": 1, "walao": 1, "eh": 1}
+        assert "SPEAKER_01" not in results
 
-            session = db.query(Session).filter(Session.id == sample_session.id).first()
 
-            speaker_results = await transcribe_and_count(
-                temp_path, mock_segments, db, session
-            )
+class TestSaveSpeakerResults:
+    """Test persisting speakers and their word counts."""
 
-            # Should have 2 speakers
-            assert "SPEAKER_00" in speaker_results
-            assert "SPEAKER_01" in speaker_results
+    def test_persists_rows_per_speaker_and_word(self, db, sample_session):
+        """Test that every speaker and word count is written, including silent speakers."""
+        segments = [
+            SpeakerSegment("SPEAKER_00", 0.0, 5.0),
+            SpeakerSegment("SPEAKER_01", 5.5, 10.0),
+            SpeakerSegment("SPEAKER_00", 10.5, 15.0),
+            SpeakerSegment("SPEAKER_02", 15.5, 18.0),  # no target words
+        ]
+        speaker_results = {
+            "SPEAKER_00": {"lah": 3, "walao": 1},
+            "SPEAKER_01": {"sia": 2},
+        }
 
-            # SPEAKER_00 had 2 segments
-            speaker_00_counts = speaker_results["SPEAKER_00"]
-            assert "wah" in speaker_00_counts or "walao" in speaker_00_counts
+        records = save_speaker_results(db, sample_session.id, speaker_results, segments)
+        db.expire_all()
 
-        finally:
-            os.unlink(temp_path)
+        speakers = {
+            s.speaker_label: s
+            for s in db.query(SessionSpeaker).filter_by(session_id=sample_session.id)
+        }
+        assert set(speakers) == set(records) == {"SPEAKER_00", "SPEAKER_01", "SPEAKER_02"}
+        assert speakers["SPEAKER_00"].segment_count == 2
+        assert speakers["SPEAKER_01"].segment_count == 1
+        assert speakers["SPEAKER_02"].segment_count == 1
+
+        labels = {s.id: label for label, s in speakers.items()}
+        rows = {
+            (labels[row.session_speaker_id], row.word): row.count
+            for row in db.query(SpeakerWordCount)
+        }
+        assert rows == {
+            ("SPEAKER_00", "lah"): 3,
+            ("SPEAKER_00", "walao"): 1,
+            ("SPEAKER_01", "sia"): 2,
+        }
+        assert speakers["SPEAKER_02"].word_counts == []
 
 
 class TestWordCountingEdgeCases:
@@ -206,15 +281,11 @@ class TestWordCountingEdgeCases:
 
     def test_empty_text(self):
         """Test counting with empty text."""
-        from services.transcription import count_target_words
-
         counts = count_target_words("")
         assert counts == {} or all(v == 0 for v in counts.values())
 
     def test_no_target_words(self):
         """Test counting when no target words present."""
-        from services.transcription import count_target_words
-
         counts = count_target_words("Hello world this is a test")
         # Should have zero counts or empty dict
         total = sum(counts.values()) if counts else 0
@@ -222,15 +293,11 @@ class TestWordCountingEdgeCases:
 
     def test_repeated_words(self):
         """Test counting repeated target words."""
-        from services.transcription import count_target_words
-
         counts = count_target_words("lah lah lah lah lah")
         assert counts.get("lah", 0) == 5
 
     def test_words_in_context(self):
         """Test that words are found in natural context."""
-        from services.transcription import count_target_words
-
         text = "Aiyo, I forgot lah! So paiseh sia, really jialat one."
         counts = count_target_words(text)
 
@@ -244,25 +311,19 @@ class TestWordCountingEdgeCases:
 class TestCorrectionsComprehensive:
     """Comprehensive tests for correction patterns."""
 
-    def test_common_misrecognitions(self):
+    @pytest.mark.parametrize("input_text, expected_word", [
+        ("while up", "walao"),
+        ("wa lao", "walao"),
+        ("la", "lah"),
+        ("low", "lor"),
+    ])
+    def test_common_misrecognitions(self, input_text, expected_word):
         """Test common ASR misrecognitions are corrected."""
-        from services.transcription import apply_corrections
-
-        test_cases = [
-            ("while up", "walao"),
-            ("wa lao", "walao"),
-            ("la", "lah"),
-            ("low", "lor"),
-        ]
-
-        for input_text, expected_word in test_cases:
-            corrected = apply_corrections(input_text).lower()
-            assert expected_word in corrected, f"'{input_text}' should contain '{expected_word}' after correction"
+        corrected = apply_corrections(input_text).lower()
+        assert expected_word in corrected, f"'{input_text}' should contain '{expected_word}' after correction"
 
     def test_corrections_preserve_other_text(self):
         """Test that corrections don't destroy surrounding text."""
-        from services.transcription import apply_corrections
-
         text = "The meeting is at three while up we need to go"
         corrected = apply_corrections(text)
 
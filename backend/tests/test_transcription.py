@@ -5,13 +5,76 @@ Tests for the external API transcription service and Singlish corrections.
 Uses mocking to avoid actual API calls.
 """
 
+import io
 import pytest
-import sys
-import os
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import NonCallableMock, patch
 
-# Add backend to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+# Audio deps are imported by services.transcription itself; skip the whole
+# module at collection time instead of erroring when they are missing
+np = pytest.importorskip("numpy")
+soundfile = pytest.importorskip("soundfile")
+
+import httpx
+
+from services.transcription import (
+    transcribe_audio,
+    transcribe_segment,
+    transcribe_segments,
+    is_using_external_api,
+    _convert_to_wav,
+    SAMPLE_RATE,
+    TARGET_WORDS,
+    CORRECTIONS,
+)
+
+_API_URL = "https://api.example.com"
+
+# Body of Flask's default 404, as sent by a notebook without /transcribe_batch
+_FLASK_NOT_FOUND = (
+    "<!doctype html>\n<html lang=en>\n<title>404 Not Found</title>\n"
+    "<h1>Not Found</h1>\n<p>The requested URL was not found on the server. "
+    "If you entered the URL manually please check your spelling and try again.</p>\n"
+)
+
+# One second of 16kHz silence, shared read-only by every fixture that needs it
+_SILENCE_1S_16K = np.zeros(SAMPLE_RATE, dtype=np.float32)
+_SILENCE_1S_16K.flags.writeable = False
+
+# Built once and specced against httpx.Response so a misspelled attribute
+# fails the test instead of silently returning a child mock
+_API_RESPONSE = NonCallableMock(spec=httpx.Response)
+
+
+@pytest.fixture
+def api_response():
+    """Shared API response mock, reset after each test."""
+    yield _API_RESPONSE
+    _API_RESPONSE.reset_mock(return_value=True, side_effect=True)
+
+
+@pytest.fixture
+def mock_http(transcription, api_response):
+    """Configure the API URL and stub the pooled client; post() returns api_response."""
+    with patch.object(transcription, "_get_transcription_api_url", return_value=_API_URL), \
+            patch.object(transcription, "_HTTP") as http:
+        http.post.return_value = api_response
+        yield http
+
+
+@pytest.fixture(scope="session")
+def mono_wav_16k():
+    """One second of 16kHz mono silence as WAV bytes, encoded once per session."""
+    buffer = io.BytesIO()
+    soundfile.write(buffer, _SILENCE_1S_16K, SAMPLE_RATE, format="WAV")
+    return buffer.getvalue()
+
+
+@pytest.fixture(scope="session")
+def mono_wav_16k_path(tmp_path_factory, mono_wav_16k):
+    """mono_wav_16k written to disk once per session."""
+    path = tmp_path_factory.mktemp("audio") / "16k.wav"
+    path.write_bytes(mono_wav_16k)
+    return str(path)
 
 
 class TestTranscribeAudio:
@@ -19,110 +82,237 @@ class TestTranscribeAudio:
 
     def test_raises_on_missing_file(self):
         """Test that FileNotFoundError is raised for missing files."""
-        from services.transcription import transcribe_audio
-
         with pytest.raises(FileNotFoundError):
             transcribe_audio("/nonexistent/path/audio.wav")
 
-    def test_raises_when_api_not_configured(self, tmp_path):
+    def test_raises_when_api_not_configured(self, transcription, fake_wav_path):
         """Test that RuntimeError is raised when API URL not set."""
-        from services.transcription import transcribe_audio
-
-        # Create a dummy audio file
-        audio_file = tmp_path / "test.wav"
-        audio_file.write_bytes(b"fake audio content")
-
-        with patch("services.transcription._get_transcription_api_url", return_value=None):
+        with patch.object(transcription, "_get_transcription_api_url", return_value=None):
             with pytest.raises(RuntimeError, match="TRANSCRIPTION_API_URL not configured"):
-                transcribe_audio(str(audio_file))
+                transcribe_audio(fake_wav_path)
 
-    def test_calls_external_api(self, tmp_path):
+    def test_calls_external_api(self, transcription, fake_wav_path, api_response, mock_http):
         """Test that transcription calls external API."""
-        from services.transcription import transcribe_audio
+        api_response.status_code = 200
+        api_response.json.return_value = {"raw_transcription": "hello world lah"}
 
-        audio_file = tmp_path / "test.wav"
-        audio_file.write_bytes(b"fake audio content")
-
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"raw_transcription": "hello world lah"}
-
-        with patch("services.transcription._get_transcription_api_url", return_value="https://api.example.com"):
-            with patch("services.transcription._convert_to_wav", return_value=b"wav_bytes"):
-                with patch("httpx.Client") as mock_client:
-                    mock_client.return_value.__enter__.return_value.post.return_value = mock_response
-                    result = transcribe_audio(str(audio_file))
+        with patch.object(transcription, "_encode_wav", return_value=b"wav_bytes"):
+            result = transcribe_audio(fake_wav_path)
 
         assert result == "hello world lah"
 
-    def test_handles_api_error(self, tmp_path):
-        """Test handling of API error responses."""
-        from services.transcription import transcribe_audio
+    def test_streams_16khz_mono_wav_from_disk(
+        self, transcription, mono_wav_16k_path, api_response, mock_http
+    ):
+        """Test that a file already in the target format is uploaded as a file object."""
+        api_response.status_code = 200
+        api_response.json.return_value = {"raw_transcription": "shiok"}
+
+        with patch.object(transcription, "_encode_wav") as mock_encode:
+            result = transcribe_audio(mono_wav_16k_path)
 
-        audio_file = tmp_path / "test.wav"
-        audio_file.write_bytes(b"fake audio content")
+        assert result == "shiok"
+        mock_encode.assert_not_called()
+        _, sent, _ = mock_http.post.call_args.kwargs["files"]["audio"]
+        assert sent.name == mono_wav_16k_path
+        assert sent.closed
 
-        mock_response = Mock()
-        mock_response.status_code = 500
-        mock_response.text = "Internal Server Error"
+    def test_handles_api_error(self, transcription, fake_wav_path, api_response, mock_http):
+        """Test handling of API error responses."""
+        api_response.status_code = 500
+        api_response.text = "Internal Server Error"
 
-        with patch("services.transcription._get_transcription_api_url", return_value="https://api.example.com"):
-            with patch("services.transcription._convert_to_wav", return_value=b"wav_bytes"):
-                with patch("httpx.Client") as mock_client:
-                    mock_client.return_value.__enter__.return_value.post.return_value = mock_response
-                    with pytest.raises(RuntimeError, match="API returned 500"):
-                        transcribe_audio(str(audio_file))
+        with patch.object(transcription, "_encode_wav", return_value=b"wav_bytes"):
+            with pytest.raises(RuntimeError, match="API returned 500"):
+                transcribe_audio(fake_wav_path)
 
 
 class TestTranscribeSegment:
     """Tests for transcribe_segment() function."""
 
-    def test_raises_when_api_not_configured(self):
+    def test_raises_when_api_not_configured(self, transcription, mono_wav_16k):
         """Test that RuntimeError is raised when API URL not set."""
-        from services.transcription import transcribe_segment
-
-        with patch("services.transcription._get_transcription_api_url", return_value=None):
+        with patch.object(transcription, "_get_transcription_api_url", return_value=None):
             with pytest.raises(RuntimeError, match="TRANSCRIPTION_API_URL not configured"):
-                transcribe_segment(b"fake audio bytes")
+                transcribe_segment(mono_wav_16k)
 
-    def test_calls_external_api(self):
+    def test_calls_external_api(self, mono_wav_16k, api_response, mock_http):
         """Test that transcription calls external API."""
-        from services.transcription import transcribe_segment
+        api_response.status_code = 200
+        api_response.json.return_value = {"raw_transcription": "test transcription"}
 
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"raw_transcription": "test transcription"}
-
-        with patch("services.transcription._get_transcription_api_url", return_value="https://api.example.com"):
-            with patch("httpx.Client") as mock_client:
-                mock_client.return_value.__enter__.return_value.post.return_value = mock_response
-                result = transcribe_segment(b"fake audio bytes")
+        result = transcribe_segment(mono_wav_16k)
 
         assert result == "test transcription"
+        _, sent, content_type = mock_http.post.call_args.kwargs["files"]["audio"]
+        assert sent == mono_wav_16k
+        assert content_type == "audio/wav"
+
+
+class TestTranscribeSegments:
+    """Tests for transcribe_segments() function."""
+
+    def test_returns_empty_list_for_no_segments(self, transcription):
+        """Test that no request is made for an empty batch."""
+        with patch.object(transcription, "_HTTP") as mock_http:
+            assert transcribe_segments([]) == []
+        mock_http.post.assert_not_called()
+
+    def test_sends_all_segments_in_one_request(self, mono_wav_16k, api_response, mock_http):
+        """Test that a batch is posted once to the batch endpoint."""
+        api_response.status_code = 200
+        api_response.json.return_value = {"transcriptions": ["one lah", "two lor"]}
+
+        result = transcribe_segments([mono_wav_16k, mono_wav_16k])
+
+        assert result == ["one lah", "two lor"]
+        mock_http.post.assert_called_once()
+        assert mock_http.post.call_args.args[0] == f"{_API_URL}/transcribe_batch"
+        sent = mock_http.post.call_args.kwargs["files"]
+        assert [field for field, _ in sent] == ["audios", "audios"]
+        assert [audio for _, (_, audio, _) in sent] == [mono_wav_16k, mono_wav_16k]
+
+    def test_falls_back_to_single_requests_on_404(
+        self, transcription, mono_wav_16k, api_response, mock_http
+    ):
+        """Test fallback to /transcribe when the server has no batch endpoint."""
+        missing = NonCallableMock(spec=httpx.Response)
+        missing.status_code = 404
+        missing.text = _FLASK_NOT_FOUND
+        api_response.status_code = 200
+        api_response.json.return_value = {"raw_transcription": "walao"}
+
+        mock_http.post.side_effect = [missing, api_response, api_response]
+        result = transcribe_segments([mono_wav_16k, mono_wav_16k])
+
+        assert result == ["walao", "walao"]
+        assert mock_http.post.call_count == 3
+
+        # Later batches skip the probe until the cooldown runs out
+        mock_http.post.side_effect = None
+        mock_http.post.reset_mock()
+        transcribe_segments([mono_wav_16k])
+        assert mock_http.post.call_args.args[0] == f"{_API_URL}/transcribe"
+
+    def test_reprobes_batch_endpoint_after_cooldown(
+        self, transcription, monkeypatch, mono_wav_16k, api_response, mock_http
+    ):
+        """Test that the batch endpoint is tried again once the cooldown expires."""
+        monkeypatch.setattr(transcription.time, "monotonic", lambda: 1000.0)
+        transcription._batch_endpoint_retry_at = 1000.0
+        api_response.status_code = 200
+        api_response.json.return_value = {"transcriptions": ["shiok"]}
+
+        assert transcribe_segments([mono_wav_16k]) == ["shiok"]
+        assert mock_http.post.call_args.args[0] == f"{_API_URL}/transcribe_batch"
+
+    def test_tunnel_404_does_not_disable_batch_endpoint(
+        self, transcription, mono_wav_16k, api_response, mock_http
+    ):
+        """Test that an ngrok 404 for an offline tunnel is a plain failure."""
+        api_response.status_code = 404
+        api_response.text = "Tunnel api.example.com not found\n\nERR_NGROK_3200\n"
+
+        with pytest.raises(RuntimeError, match="API returned 404"):
+            transcribe_segments([mono_wav_16k])
+
+        assert transcription._batch_endpoint_retry_at == 0.0
+        mock_http.post.assert_called_once()
+
+    def test_single_request_fallback_skips_failed_segment(
+        self, transcription, mono_wav_16k, api_response, mock_http
+    ):
+        """Test that one failed segment in the fallback doesn't abort the others."""
+        transcription._batch_endpoint_retry_at = float("inf")
+        api_response.status_code = 200
+        api_response.json.return_value = {"raw_transcription": "shiok"}
+
+        mock_http.post.side_effect = [api_response, httpx.ConnectError("reset"), api_response]
+        result = transcribe_segments([mono_wav_16k] * 3)
+
+        assert result == ["shiok", "", "shiok"]
+        assert mock_http.post.call_count == 3
+
+
+class TestConvertToWav:
+    """Tests for _convert_to_wav() function."""
+
+    def test_passes_through_16khz_mono_wav(self, mono_wav_16k_path, mono_wav_16k):
+        """Test that audio already in the target format is not re-encoded."""
+        with patch.object(soundfile, "read") as mock_read:
+            assert _convert_to_wav(mono_wav_16k_path) == mono_wav_16k
+        mock_read.assert_not_called()
+
+    def test_resamples_non_16khz_audio(self, tmp_path):
+        """Test that 44.1kHz input is resampled to 16kHz."""
+        audio_file = tmp_path / "44k.wav"
+        soundfile.write(str(audio_file), np.zeros(44100, dtype=np.float32), 44100)
+
+        data, sr = soundfile.read(io.BytesIO(_convert_to_wav(str(audio_file))))
+
+        assert sr == SAMPLE_RATE
+        assert data.ndim == 1
+        assert abs(len(data) - SAMPLE_RATE) <= 1
+
+    def test_converts_stereo_to_mono(self, tmp_path):
+        """Test that stereo input is downmixed to mono."""
+        stereo = np.zeros((SAMPLE_RATE, 2), dtype=np.float32)
+        stereo[:, 0] = 0.5
+        audio_file = tmp_path / "stereo.wav"
+        soundfile.write(str(audio_file), stereo, SAMPLE_RATE)
+
+        data, sr = soundfile.read(io.BytesIO(_convert_to_wav(str(audio_file))))
+
+        assert sr == SAMPLE_RATE
+        assert data.ndim == 1
+        assert np.allclose(data, 0.25, atol=1e-3)
+
+    def test_pipes_unsupported_containers_through_ffmpeg(self, transcription, tmp_path):
+        """Test that m4a input is converted by one ffmpeg call and wrapped as WAV."""
+        audio_file = tmp_path / "clip.m4a"
+        audio_file.write_bytes(b"not a libsndfile container")
+        pcm = np.zeros(SAMPLE_RATE, dtype="<i2").tobytes()
+
+        with patch.object(transcription, "_FFMPEG", "ffmpeg"), \
+             patch.object(transcription.subprocess, "run") as mock_run:
+            mock_run.return_value.stdout = pcm
+            data, sr = soundfile.read(io.BytesIO(_convert_to_wav(str(audio_file))))
+
+        args = mock_run.call_args.args[0]
+        assert args[args.index("-ar") + 1] == str(SAMPLE_RATE)
+        assert args[args.index("-ac") + 1] == "1"
+        assert sr == SAMPLE_RATE
+        assert len(data) == SAMPLE_RATE
 
 
 class TestIsUsingExternalApi:
     """Tests for is_using_external_api() function."""
 
-    def test_returns_true_when_url_configured(self):
+    def test_returns_true_when_url_configured(self, transcription):
         """Test returns True when API URL is set."""
-        from services.transcription import is_using_external_api
-
-        with patch("services.transcription._get_transcription_api_url", return_value="https://api.example.com"):
+        with patch.object(transcription, "_get_transcription_api_url", return_value=_API_URL):
             assert is_using_external_api() is True
 
-    def test_returns_false_when_url_not_configured(self):
+    def test_returns_false_when_url_not_configured(self, transcription):
         """Test returns False when API URL is not set."""
-        from services.transcription import is_using_external_api
-
-        with patch("services.transcription._get_transcription_api_url", return_value=None):
+        with patch.object(transcription, "_get_transcription_api_url", return_value=None):
             assert is_using_external_api() is False
 
-    def test_returns_false_for_empty_string(self):
-        """Test returns False when API URL is empty string."""
-        from services.transcription import is_using_external_api
+    def test_reload_config_rereads_url(self, transcription, monkeypatch):
+        """Test that the cached URL is refreshed by reload_config()."""
+        monkeypatch.setattr("config.settings.TRANSCRIPTION_API_URL", _API_URL)
+        transcription.reload_config()
+        assert is_using_external_api() is True
+
+        monkeypatch.setattr("config.settings.TRANSCRIPTION_API_URL", None)
+        assert is_using_external_api() is True  # still cached
+
+        transcription.reload_config()
+        assert is_using_external_api() is False
 
-        with patch("services.transcription._get_transcription_api_url", return_value=""):
+    def test_returns_false_for_empty_string(self, transcription):
+        """Test returns False when API URL is empty string."""
+        with patch.object(transcription, "_get_transcription_api_url", return_value=""):
             assert is_using_external_api() is False
 
 
@@ -131,14 +321,10 @@ class TestConstants:
 
     def test_sample_rate_is_16khz(self):
         """Test that sample rate is 16kHz."""
-        from services.transcription import SAMPLE_RATE
-
         assert SAMPLE_RATE == 16000
 
     def test_target_words_includes_key_singlish(self):
         """Test that TARGET_WORDS includes key Singlish words."""
-        from services.transcription import TARGET_WORDS
-
         assert "lah" in TARGET_WORDS
         assert "walao" in TARGET_WORDS
         assert "shiok" in TARGET_WORDS
@@ -146,8 +332,6 @@ class TestConstants:
 
     def test_corrections_handles_common_misrecognitions(self):
         """Test that CORRECTIONS includes common ASR mistakes."""
-        from services.transcription import CORRECTIONS
-
         assert CORRECTIONS.get("wa lao") == "walao"
         assert CORRECTIONS.get("cheap buy") == "cheebai"
         assert CORRECTIONS.get("lunch hour") == "lanjiao"
@@ -300,6 +300,24 @@ class TestApplyCorrections:
         result = apply_corrections(text)
         assert "sia" in result.lower()
 
+    def test_correct_spelling_not_corrected_again(self):
+        """Already-correct words are not re-corrected ('paiseh' -> 'paisehh')."""
+        text = "so pai se, paiseh sia, chope seat"
+        result = apply_corrections(text)
+        assert result == "so paiseh, paiseh sia, chope seat"
+
+    def test_no_correction_inside_word(self):
+        """Multi-word corrections respect word boundaries ('chopstick')."""
+        text = "use the chopstick"
+        result = apply_corrections(text)
+        assert result == "use the chopstick"
+
+    def test_longest_shared_prefix_wins(self):
+        """Keys sharing a prefix resolve to the longest one ('wah lao eh' over 'wah la')."""
+        text = "wah lao eh so late, wah la"
+        result = apply_corrections(text)
+        assert result == "walao so late, walao"
+
 
 # ============================================================================
 # Tests for process_transcription()
@@ -337,6 +355,14 @@ class TestProcessTranscription:
         assert corrected == ""
         assert counts == {}
 
+    def test_process_repeated_text_returns_fresh_counts(self):
+        """Test that mutating a (memoized) result does not leak into later calls."""
+        _, counts = process_transcription("shiok lah")
+        counts['lah'] = 99
+
+        _, again = process_transcription("shiok lah")
+        assert again == {'shiok': 1, 'lah': 1}
+
     def test_process_realistic_sentence(self):
         """Test with a realistic Singlish sentence."""
         text = "wa lao eh why you never jio me? so pie say sia"
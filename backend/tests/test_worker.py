@@ -0,0 +1,191 @@
+"""
+tests/test_worker.py - Background Worker Tests
+
+Tests the worker's Redis handling (blocking pop, shutdown unblocking) and
+job hand-off against a mocked Redis client.
+"""
+
+import json
+import threading
+import uuid
+import pytest
+from unittest.mock import MagicMock, patch
+
+import worker
+from worker import FAILED_QUEUE, PROCESSING_QUEUE, REDIS_TIMEOUT
+
+_PAYLOAD = json.dumps({
+    "session_id": str(uuid.uuid4()),
+    "queued_at": "2026-01-01T00:00:00",
+}).encode()
+
+
+@pytest.fixture(autouse=True)
+def worker_state(monkeypatch):
+    """Reset the worker's module-level Redis, database and shutdown state for one test."""
+    monkeypatch.setattr(worker, "_blocked_pop", None)
+    monkeypatch.setattr(worker, "_db", None)
+    worker.shutdown_event.clear()
+    yield
+    worker.shutdown_event.clear()
+
+
+@pytest.fixture
+def blocking_client():
+    """Client pinned for blocking pops."""
+    return MagicMock()
+
+
+class TestDequeueJob:
+    """Tests for dequeue_job() function."""
+
+    def test_pops_oldest_job_with_brpop(self, blocking_client):
+        """Test that a single job is popped from the consuming end."""
+        blocking_client.brpop.return_value = (PROCESSING_QUEUE.encode(), _PAYLOAD)
+
+        assert worker.dequeue_job(blocking_client) == _PAYLOAD
+        blocking_client.brpop.assert_called_once_with(PROCESSING_QUEUE, timeout=REDIS_TIMEOUT)
+
+    def test_returns_none_on_timeout(self, blocking_client):
+        """Test that an empty queue yields None after the blocking timeout."""
+        blocking_client.brpop.return_value = None
+
+        assert worker.dequeue_job(blocking_client) is None
+
+    def test_does_not_block_after_shutdown(self, blocking_client):
+        """Test that no pop is started once shutdown was requested."""
+        worker.shutdown_event.set()
+
+        assert worker.dequeue_job(blocking_client) is None
+        blocking_client.brpop.assert_not_called()
+
+
+class TestBlockingClient:
+    """Tests for create_blocking_client() and unblock_on_shutdown()."""
+
+    def test_pins_connection_and_publishes_id(self):
+        """Test that the pinned client's id is looked up once and published."""
+        redis_client = MagicMock()
+
+        with patch.object(worker.redis, "Redis") as redis_cls:
+            redis_cls.return_value.client_id.return_value = 42
+            blocking_client = worker.create_blocking_client(redis_client)
+
+        redis_cls.assert_called_once_with(
+            connection_pool=redis_client.connection_pool,
+            single_connection_client=True,
+        )
+        assert blocking_client is redis_cls.return_value
+        assert worker._blocked_pop == (redis_client, 42)
+
+    def test_unblocks_pinned_connection_on_shutdown(self, monkeypatch):
+        """Test that shutdown sends CLIENT UNBLOCK for the pinned connection."""
+        redis_client = MagicMock()
+        monkeypatch.setattr(worker, "_blocked_pop", (redis_client, 42))
+        thread = threading.Thread(target=worker.unblock_on_shutdown, daemon=True)
+        thread.start()
+
+        redis_client.client_unblock.assert_not_called()
+        worker.shutdown_event.set()
+        thread.join(timeout=5)
+
+        assert not thread.is_alive()
+        redis_client.client_unblock.assert_called_once_with(42)
+
+
+class TestWorkerDb:
+    """Tests for get_worker_db() and close_worker_db()."""
+
+    def test_opens_one_session_on_first_use(self):
+        """Test that the session is created lazily and then reused."""
+        with patch.object(worker, "SessionLocal") as session_local:
+            db = worker.get_worker_db()
+
+            assert worker.get_worker_db() is db
+        session_local.assert_called_once_with()
+
+    def test_close_releases_session(self):
+        """Test that closing drops the session so the next use opens a new one."""
+        with patch.object(worker, "SessionLocal"):
+            db = worker.get_worker_db()
+            worker.close_worker_db()
+
+        db.close.assert_called_once_with()
+        assert worker._db is None
+
+    def test_close_without_session_is_noop(self):
+        """Test that shutdown before any status update doesn't open a session."""
+        with patch.object(worker, "SessionLocal") as session_local:
+            worker.close_worker_db()
+
+        session_local.assert_not_called()
+
+
+class TestProcessJob:
+    """Tests for process_job() function."""
+
+    def test_requeues_instead_of_failing_on_shutdown(self):
+        """Test that a shutdown during the retry backoff does not fail the session."""
+        worker.shutdown_event.set()
+
+        with patch.object(worker, "process_session_sync", side_effect=RuntimeError("API down")), \
+             patch.object(worker, "update_session_failure") as mock_failure, \
+             patch.object(worker, "update_session_requeued") as mock_requeued:
+            result = worker.process_job(json.loads(_PAYLOAD), MagicMock())
+
+        assert result is None
+        mock_failure.assert_not_called()
+        mock_requeued.assert_called_once()
+
+
+class TestMainLoop:
+    """Tests for main() job hand-off to the Redis queues."""
+
+    @pytest.fixture
+    def run_worker(self):
+        """Run main() against a mocked Redis client, popping the given payloads in order."""
+        redis_client = MagicMock()
+
+        def run(payloads, process_job=None):
+            def pop(_blocking_client):
+                if payloads:
+                    return payloads.pop(0)
+                worker.shutdown_event.set()
+                return None
+
+            with patch.object(worker.signal, "signal"), \
+                 patch.object(worker.threading, "Thread"), \
+                 patch.object(worker, "create_worker_redis_client", return_value=redis_client), \
+                 patch.object(worker, "create_blocking_client"), \
+                 patch.object(worker, "dequeue_job", side_effect=pop), \
+                 patch.object(worker, "process_job", side_effect=process_job) as mock_process, \
+                 pytest.raises(SystemExit):
+                worker.main()
+            return redis_client, mock_process
+
+        return run
+
+    def test_pushes_failed_job_immediately(self, run_worker):
+        """Test that a failed job is pushed to FAILED_QUEUE as soon as it fails."""
+        redis_client, _ = run_worker([_PAYLOAD], lambda *args: False)
+
+        redis_client.lpush.assert_called_once_with(FAILED_QUEUE, _PAYLOAD)
+        redis_client.rpush.assert_not_called()
+
+    def test_pushes_invalid_json_to_failed_queue(self, run_worker):
+        """Test that an unparseable payload is moved aside without processing."""
+        redis_client, mock_process = run_worker([b"not json"])
+
+        redis_client.lpush.assert_called_once_with(FAILED_QUEUE, b"not json")
+        mock_process.assert_not_called()
+
+    def test_requeues_job_interrupted_by_shutdown(self, run_worker):
+        """Test that a job cut short by shutdown goes back to the consuming end."""
+        def interrupted(*args):
+            worker.shutdown_event.set()
+            return None
+
+        redis_client, _ = run_worker([_PAYLOAD], interrupted)
+
+        redis_client.rpush.assert_called_once_with(PROCESSING_QUEUE, _PAYLOAD)
+        redis_client.lpush.assert_not_called()
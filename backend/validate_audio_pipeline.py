@@ -12,8 +12,10 @@ USAGE:
     python validate_audio_pipeline.py
 """
 
-import wave
-import json
+import os
+import struct
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Tuple
 
@@ -26,14 +28,36 @@ EXPECTED_FORMAT = {
     "container": "WAV"
 }
 
+# Files checked by this script, relative to the backend directory
+BACKEND_DIR = Path(__file__).parent
+MOBILE_RECORDING_CONFIG = BACKEND_DIR.parent / "mobile" / "src" / "hooks" / "useRecording.ts"
+TRANSCRIPTION_SERVICE = BACKEND_DIR / "services" / "transcription.py"
+PROCESSOR = BACKEND_DIR / "processor.py"
+MODELS = BACKEND_DIR / "models.py"
+TEST_AUDIO_DIR = BACKEND_DIR / "test_audio"
+
+# Canonical 44-byte PCM WAV header: RIFF descriptor, "fmt " chunk, then the
+# header of the "data" chunk (id + size)
+WAV_HEADER = struct.Struct('<4sI4s4sIHHIIHH4sI')
+WAVE_FORMAT_PCM = 1
+
+
+# ANSI colors only when writing to a terminal that supports them, so CI
+# logs and redirected output stay plain (honours NO_COLOR and TERM=dumb)
+USE_COLOR = (
+    sys.stdout.isatty()
+    and "NO_COLOR" not in os.environ
+    and os.environ.get("TERM") != "dumb"
+)
+
 
 class Colors:
-    GREEN = '\033[92m'
-    RED = '\033[91m'
-    YELLOW = '\033[93m'
-    BLUE = '\033[94m'
-    END = '\033[0m'
-    BOLD = '\033[1m'
+    GREEN = '\033[92m' if USE_COLOR else ''
+    RED = '\033[91m' if USE_COLOR else ''
+    YELLOW = '\033[93m' if USE_COLOR else ''
+    BLUE = '\033[94m' if USE_COLOR else ''
+    END = '\033[0m' if USE_COLOR else ''
+    BOLD = '\033[1m' if USE_COLOR else ''
 
 
 def print_header(text: str):
@@ -54,6 +78,65 @@ def print_info(text: str):
     print(f"{Colors.YELLOW}ℹ {text}{Colors.END}")
 
 
+def _read_chunk_header(f) -> Tuple[bytes, int]:
+    """Read the (id, size) header of the RIFF chunk at the current position."""
+    chunk = f.read(8)
+    if len(chunk) < 8:
+        raise ValueError("no data chunk found")
+    return struct.unpack('<4sI', chunk)
+
+
+def _read_wav_header(file_path: Path) -> Dict:
+    """
+    Parse the format fields of a PCM WAV file from its RIFF header.
+
+    Reads the fixed 44-byte header in one go instead of going through the
+    wave module. If extra chunks (e.g. LIST) sit before "data", the chunk
+    list is walked with seeks so the audio itself is never read.
+    """
+    with open(file_path, 'rb') as f:
+        header = f.read(WAV_HEADER.size)
+        if len(header) < WAV_HEADER.size:
+            raise ValueError("file too short for a WAV header")
+
+        (riff, _, wave_id, fmt_id, fmt_size, audio_format, channels,
+         sample_rate, byte_rate, _, bits_per_sample,
+         chunk_id, chunk_size) = WAV_HEADER.unpack(header)
+
+        if riff != b'RIFF' or wave_id != b'WAVE' or fmt_id != b'fmt ':
+            raise ValueError("not a RIFF/WAVE file")
+
+        # With a plain 16-byte fmt chunk the last two header fields already
+        # describe the next chunk; a fmt extension pushes it further out
+        if fmt_size != 16:
+            f.seek(20 + fmt_size + (fmt_size & 1))
+            chunk_id, chunk_size = _read_chunk_header(f)
+
+        # Skip non-data chunks such as LIST (chunks are word aligned)
+        while chunk_id != b'data':
+            f.seek(chunk_size + (chunk_size & 1), 1)
+            chunk_id, chunk_size = _read_chunk_header(f)
+
+    if audio_format != WAVE_FORMAT_PCM:
+        raise ValueError(f"unsupported WAV encoding {audio_format} (expected PCM)")
+
+    sample_width = bits_per_sample // 8
+    return {
+        "sample_rate": sample_rate,
+        "channels": channels,
+        "sample_width": sample_width,
+        "num_frames": chunk_size // (channels * sample_width),
+        "duration": chunk_size / byte_rate,
+    }
+
+
+def _find_needles(content: bytes, needles) -> set:
+    """Return which of `needles` occur in raw file `content`."""
+    # One substring search per needle, so a needle that only occurs inside
+    # another one is still found
+    return {needle for needle in needles if needle.encode() in content}
+
+
 def validate_wav_format(file_path: Path) -> Tuple[bool, Dict]:
     """
     Validate a WAV file matches expected format.
@@ -62,45 +145,37 @@ def validate_wav_format(file_path: Path) -> Tuple[bool, Dict]:
         (is_valid, format_info)
     """
     try:
-        with wave.open(str(file_path), 'r') as wav:
-            format_info = {
-                "sample_rate": wav.getframerate(),
-                "channels": wav.getnchannels(),
-                "sample_width": wav.getsampwidth(),
-                "num_frames": wav.getnframes(),
-                "duration": wav.getnframes() / wav.getframerate()
-            }
-            
-            # Check each requirement
-            is_valid = True
-            issues = []
-            
-            if format_info["sample_rate"] != EXPECTED_FORMAT["sample_rate"]:
-                is_valid = False
-                issues.append(f"Sample rate: {format_info['sample_rate']} (expected {EXPECTED_FORMAT['sample_rate']})")
-            
-            if format_info["channels"] != EXPECTED_FORMAT["channels"]:
-                is_valid = False
-                issues.append(f"Channels: {format_info['channels']} (expected {EXPECTED_FORMAT['channels']})")
-            
-            if format_info["sample_width"] != EXPECTED_FORMAT["sample_width"]:
-                is_valid = False
-                issues.append(f"Bit depth: {format_info['sample_width']*8}-bit (expected {EXPECTED_FORMAT['sample_width']*8}-bit)")
-            
-            format_info["is_valid"] = is_valid
-            format_info["issues"] = issues
-            
-            return is_valid, format_info
-            
+        format_info = _read_wav_header(file_path)
     except Exception as e:
         return False, {"error": str(e)}
 
+    # Check each requirement
+    is_valid = True
+    issues = []
+    
+    if format_info["sample_rate"] != EXPECTED_FORMAT["sample_rate"]:
+        is_valid = False
+        issues.append(f"Sample rate: {format_info['sample_rate']} (expected {EXPECTED_FORMAT['sample_rate']})")
+    
+    if format_info["channels"] != EXPECTED_FORMAT["channels"]:
+        is_valid = False
+        issues.append(f"Channels: {format_info['channels']} (expected {EXPECTED_FORMAT['channels']})")
+    
+    if format_info["sample_width"] != EXPECTED_FORMAT["sample_width"]:
+        is_valid = False
+        issues.append(f"Bit depth: {format_info['sample_width']*8}-bit (expected {EXPECTED_FORMAT['sample_width']*8}-bit)")
+    
+    format_info["is_valid"] = is_valid
+    format_info["issues"] = issues
+    
+    return is_valid, format_info
+
 
 def check_frontend_config():
     """Check frontend audio recording configuration"""
     print_header("1. Frontend Audio Configuration")
     
-    mobile_config_path = Path(__file__).parent.parent / "mobile" / "src" / "hooks" / "useRecording.ts"
+    mobile_config_path = MOBILE_RECORDING_CONFIG
     
     if not mobile_config_path.exists():
         print_error(f"Frontend config not found: {mobile_config_path}")
@@ -108,9 +183,9 @@ def check_frontend_config():
     
     print_success(f"Found frontend config: {mobile_config_path.name}")
     
-    # Read and check configuration
-    with open(mobile_config_path, 'r') as f:
-        content = f.read()
+    # Read and check configuration. Matched as raw bytes, so the file is
+    # never decoded (and the locale's default encoding does not matter)
+    content = mobile_config_path.read_bytes()
     
     checks = {
         "sampleRate: 16000": "✓ Sample rate: 16000 Hz",
@@ -119,9 +194,10 @@ def check_frontend_config():
         "extension: '.wav'": "✓ Format: WAV"
     }
     
+    found = _find_needles(content, checks)
     all_found = True
     for check, message in checks.items():
-        if check in content:
+        if check in found:
             print_success(message)
         else:
             print_error(f"Missing: {check}")
@@ -140,34 +216,32 @@ def check_backend_processing():
     print_header("2. Backend Processing Configuration")
     
     # Check transcription service
-    transcription_path = Path(__file__).parent / "services" / "transcription.py"
+    transcription_path = TRANSCRIPTION_SERVICE
     if not transcription_path.exists():
         print_error(f"Transcription service not found: {transcription_path}")
         return False
     
     print_success(f"Found transcription service: {transcription_path.name}")
     
-    with open(transcription_path, 'r') as f:
-        content = f.read()
+    content = transcription_path.read_bytes()
     
-    if "SAMPLE_RATE = 16000" in content:
+    if b"SAMPLE_RATE = 16000" in content:
         print_success("✓ Transcription expects 16000 Hz")
     else:
         print_error("✗ Transcription sample rate mismatch")
         return False
     
     # Check processor
-    processor_path = Path(__file__).parent / "processor.py"
+    processor_path = PROCESSOR
     if not processor_path.exists():
         print_error(f"Processor not found: {processor_path}")
         return False
     
     print_success(f"Found processor: {processor_path.name}")
     
-    with open(processor_path, 'r') as f:
-        content = f.read()
+    content = processor_path.read_bytes()
     
-    if "set_frame_rate(SAMPLE_RATE).set_channels(1)" in content:
+    if b"set_frame_rate(SAMPLE_RATE).set_channels(1)" in content:
         print_success("✓ Processor converts to 16kHz mono")
     else:
         print_error("✗ Processor audio conversion not found")
@@ -181,7 +255,7 @@ def check_test_audio_files():
     """Check test audio files"""
     print_header("3. Test Audio Files")
     
-    test_audio_dir = Path(__file__).parent / "test_audio"
+    test_audio_dir = TEST_AUDIO_DIR
     
     if not test_audio_dir.exists():
         print_info(f"Test audio directory not found: {test_audio_dir}")
@@ -199,11 +273,14 @@ def check_test_audio_files():
     
     print_success(f"Found {len(wav_files)} WAV files")
     
-    # Validate each file
+    # Validate each file. Header reads are I/O bound, so run them on a
+    # thread pool; map() keeps the results in sorted order for printing
+    wav_files.sort()
+    with ThreadPoolExecutor(max_workers=min(32, len(wav_files))) as executor:
+        results = list(executor.map(validate_wav_format, wav_files))
+
     all_valid = True
-    for wav_file in sorted(wav_files):
-        is_valid, format_info = validate_wav_format(wav_file)
-        
+    for wav_file, (is_valid, format_info) in zip(wav_files, results):
         if is_valid:
             print_success(f"✓ {wav_file.name}")
             print_info(f"  {format_info['sample_rate']}Hz, {format_info['channels']}ch, "
@@ -229,7 +306,7 @@ def check_database_schema():
     """Check database schema for audio storage"""
     print_header("4. Database Schema")
     
-    models_path = Path(__file__).parent / "models.py"
+    models_path = MODELS
     
     if not models_path.exists():
         print_error(f"Models file not found: {models_path}")
@@ -237,8 +314,7 @@ def check_database_schema():
     
     print_success(f"Found models: {models_path.name}")
     
-    with open(models_path, 'r') as f:
-        content = f.read()
+    content = models_path.read_bytes()
     
     # Check AudioChunk model
     checks = [
@@ -248,9 +324,10 @@ def check_database_schema():
         ("chunk_number = Column(Integer", "chunk_number column")
     ]
     
+    found = _find_needles(content, (check for check, _ in checks))
     all_found = True
     for check, description in checks:
-        if check in content:
+        if check in found:
             print_success(f"✓ {description} exists")
         else:
             print_error(f"✗ {description} not found")
@@ -34,15 +34,25 @@ import logging
 import time
 import signal
 import sys
-from typing import Dict, Optional
+import threading
+from typing import Dict, Optional, Tuple
 from uuid import UUID
 from datetime import datetime
 
 import redis
 from redis.exceptions import ConnectionError as RedisConnectionError
+from sqlalchemy import update
+from sqlalchemy.orm import Session as OrmSession
+
+try:
+    # Faster payload parsing; its JSONDecodeError subclasses json's
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 from config import settings
 from processor import process_session_sync
+from redis_client import create_redis_client
 from database import SessionLocal
 from models import Session as SessionModel
 
@@ -69,10 +79,23 @@ FAILED_QUEUE = "lahstats:failed"
 MAX_RETRIES = 3
 RETRY_DELAY_BASE = 5  # seconds (will be: 5s, 10s, 20s)
 SHUTDOWN_TIMEOUT = 30  # seconds to wait for current job before forcing shutdown
-REDIS_TIMEOUT = 1  # seconds for blocking pop timeout (to check shutdown flag)
+REDIS_TIMEOUT = 30  # seconds for blocking pop timeout (shutdown interrupts it sooner)
+WORKER_REDIS_CONNECTIONS = 4  # one job at a time, so a small pool is plenty
+
+# Set by the signal handler. Every wait in the worker (retry backoff,
+# reconnect and error pauses) waits on it, so shutdown interrupts them
+shutdown_event = threading.Event()
+
+# (client to send CLIENT UNBLOCK through, server-side id of the connection
+# pinned for blocking pops), so a shutdown can end an idle wait instead of
+# sitting it out. Set by create_blocking_client()
+_blocked_pop: Optional[Tuple[redis.Redis, int]] = None
 
-# Global shutdown flag
-shutdown_requested = False
+# Database session reused for status updates across jobs. The worker runs
+# one job at a time, so a single session is safe; it is rolled back after
+# errors so no failed state leaks into the next update. Opened on first use
+# by get_worker_db() so importing the worker doesn't touch the database
+_db: Optional[OrmSession] = None
 
 # ============================================================================
 # SIGNAL HANDLERS
@@ -85,53 +108,187 @@ def signal_handler(signum, frame):
     Allows current job to complete before shutting down.
     Triggered by SIGTERM (docker stop) or SIGINT (Ctrl+C).
     """
-    global shutdown_requested
     signal_names = {
         signal.SIGTERM: "SIGTERM",
         signal.SIGINT: "SIGINT"
     }
     signal_name = signal_names.get(signum, str(signum))
     
-    logger.info(f"📥 Received {signal_name}, initiating graceful shutdown...")
+    logger.info("📥 Received %s, initiating graceful shutdown...", signal_name)
     logger.info("⏳ Waiting for current job to complete...")
-    shutdown_requested = True
+    shutdown_event.set()
+
+
+def unblock_on_shutdown() -> None:
+    """
+    Interrupt an idle blocking pop once shutdown is requested.
+    
+    Runs in a daemon thread, because the main thread is stuck in the blocking
+    socket read. CLIENT UNBLOCK makes the server answer the pop as if it
+    had timed out. That is decided server-side, so a job is never popped and
+    then dropped on the way to a worker that is exiting. If the pinned
+    connection is not blocked at that moment, the command is a no-op.
+    """
+    shutdown_event.wait()
+    blocked = _blocked_pop
+    if blocked is None:
+        return
+    
+    redis_client, client_id = blocked
+    try:
+        redis_client.client_unblock(client_id)
+        logger.debug("Interrupted idle blocking pop (client %s)", client_id)
+    except Exception as e:
+        # Worst case the pop runs to REDIS_TIMEOUT before the loop exits
+        logger.debug("Could not interrupt blocking pop: %s", e)
+
+
+# ============================================================================
+# REDIS CONNECTION
+# ============================================================================
+
+def create_worker_redis_client() -> redis.Redis:
+    """
+    Create the worker's Redis client.
+    
+    Replies stay raw bytes: payloads go straight to json_loads() and back to
+    LPUSH/RPUSH, so decoding them to str would be wasted work. The socket
+    timeout sits a little above REDIS_TIMEOUT, so a blocking pop is never cut
+    short, but a connection that silently died mid-command is detected and
+    retried instead of hanging the worker.
+    """
+    return create_redis_client(
+        max_connections=WORKER_REDIS_CONNECTIONS,
+        decode_responses=False,
+        socket_timeout=REDIS_TIMEOUT + 5,
+    )
+
+
+def create_blocking_client(redis_client: redis.Redis) -> redis.Redis:
+    """
+    Pin one pooled connection for blocking pops and publish its id.
+    
+    Done once at startup (and again after a reconnect), not per pop, so each
+    pop is a single round trip. CLIENT UNBLOCK is sent through redis_client,
+    because the pinned connection is busy blocking. If redis-py silently
+    reconnects the pinned connection, the published id goes stale and a
+    shutdown waits out at most REDIS_TIMEOUT instead.
+    """
+    global _blocked_pop
+    blocking_client = redis.Redis(
+        connection_pool=redis_client.connection_pool,
+        single_connection_client=True,
+    )
+    _blocked_pop = (redis_client, blocking_client.client_id())
+    return blocking_client
 
 
 # ============================================================================
 # JOB PROCESSING
 # ============================================================================
 
-def update_session_failure(session_id: str, error_message: str) -> None:
+def dequeue_job(blocking_client: redis.Redis) -> Optional[bytes]:
+    """
+    Pop the oldest job from the processing queue, blocking until one arrives.
+    
+    Only one job is taken at a time: a job runs for tens of seconds to
+    minutes, so anything a worker took ahead of time would sit in its memory
+    while idle workers wait, and would be lost if the worker died.
+    
+    Args:
+        blocking_client: Client pinned by create_blocking_client(), whose
+            wait unblock_on_shutdown() can interrupt
+        
+    Returns:
+        Raw (undecoded) job payload, or None on timeout or shutdown
+    """
+    if shutdown_event.is_set():
+        return None
+    
+    # Producers LPUSH, so BRPOP takes the oldest job. The timeout is only a fallback; shutdown interrupts the pop sooner
+    result = blocking_client.brpop(PROCESSING_QUEUE, timeout=REDIS_TIMEOUT)
+    return result[1] if result else None
+
+
+def get_worker_db() -> OrmSession:
+    """
+    Get the worker's shared database session, opening it on first use.
+    
+    Returns:
+        SQLAlchemy session, closed by close_worker_db() on shutdown
+    """
+    global _db
+    if _db is None:
+        _db = SessionLocal()
+    return _db
+
+
+def close_worker_db() -> None:
+    """Close the shared database session, if one was opened."""
+    global _db
+    if _db is not None:
+        _db.close()
+        _db = None
+
+
+def update_session_failure(session_id: UUID, error_message: str) -> None:
     """
     Update session status to 'failed' in database.
     
     Args:
-        session_id: Session UUID as string
+        session_id: Session UUID
         error_message: Error description
     """
-    logger.debug(f"Updating session {session_id} to failed status...")
+    logger.debug("Updating session %s to failed status...", session_id)
     
+    db = get_worker_db()
     try:
-        db = SessionLocal()
-        session = db.query(SessionModel).filter(
-            SessionModel.id == UUID(session_id)
-        ).first()
+        # Single UPDATE instead of SELECT + ORM flush; rowcount tells us
+        # whether the session existed
+        result = db.execute(
+            update(SessionModel)
+            .where(SessionModel.id == session_id)
+            .values(
+                status="failed",
+                error_message=error_message[:500],  # Truncate if too long
+            )
+        )
+        db.commit()
         
-        if session:
-            session.status = "failed"
-            session.error_message = error_message[:500]  # Truncate if too long
-            db.commit()
-            logger.info(f"📝 Updated session {session_id} status to 'failed'")
-            logger.debug(f"   Error message: {error_message[:100]}")
+        if result.rowcount:
+            logger.info("📝 Updated session %s status to 'failed'", session_id)
+            logger.debug("   Error message: %s", error_message[:100])
         else:
-            logger.warning(f"⚠️  Session {session_id} not found in database")
-        
-        db.close()
+            logger.warning("⚠️  Session %s not found in database", session_id)
     except Exception as e:
-        logger.error(f"❌ Failed to update session status in DB: {e}", exc_info=True)
+        db.rollback()
+        logger.error("❌ Failed to update session status in DB: %s", e, exc_info=True)
 
 
-def process_job(job_data: Dict, redis_client: redis.Redis) -> bool:
+def update_session_requeued(session_id: UUID) -> None:
+    """
+    Put a session back in the state it was queued in ('processing', 0%).
+    
+    processor.process_session() marks the session failed after every failed
+    attempt; this undoes that when the job goes back to the queue instead.
+    
+    Args:
+        session_id: Session UUID
+    """
+    db = get_worker_db()
+    try:
+        db.execute(
+            update(SessionModel)
+            .where(SessionModel.id == session_id)
+            .values(status="processing", progress=0, error_message=None)
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error("❌ Failed to reset session status in DB: %s", e, exc_info=True)
+
+
+def process_job(job_data: Dict, redis_client: redis.Redis) -> Optional[bool]:
     """
     Process a single job with retry logic.
     
@@ -140,20 +297,29 @@ def process_job(job_data: Dict, redis_client: redis.Redis) -> bool:
         redis_client: Redis client for pushing to failed queue
         
     Returns:
-        True if successful, False if failed after all retries
+        True if successful, False if failed after all retries, None if a
+        shutdown cut the retries short and the job should be re-queued
     """
     session_id = job_data.get("session_id")
     queued_at = job_data.get("queued_at", "unknown")
     
     if not session_id:
         logger.error("❌ Job missing 'session_id' field")
-        logger.debug(f"   Job data: {job_data}")
+        logger.debug("   Job data: %s", job_data)
+        return False
+    
+    # Parse once up front so a malformed id fails here, not inside the
+    # processing pipeline or the database layer
+    try:
+        session_id = UUID(str(session_id))
+    except ValueError:
+        logger.error("❌ Job has invalid 'session_id': %r", session_id)
         return False
     
     logger.info("=" * 70)
-    logger.info(f"🎬 Processing session: {session_id}")
-    logger.info(f"   Queued at: {queued_at}")
-    logger.debug(f"   Full job data: {job_data}")
+    logger.info("🎬 Processing session: %s", session_id)
+    logger.info("   Queued at: %s", queued_at)
+    logger.debug("   Full job data: %s", job_data)
     logger.info("-" * 70)
     
     # Retry loop with exponential backoff
@@ -161,22 +327,22 @@ def process_job(job_data: Dict, redis_client: redis.Redis) -> bool:
     
     for attempt in range(1, MAX_RETRIES + 1):
         try:
-            logger.debug(f"Starting attempt {attempt}/{MAX_RETRIES}...")
+            logger.debug("Starting attempt %s/%s...", attempt, MAX_RETRIES)
             
             # Run the processing pipeline
-            start_time = time.time()
+            start_time = time.monotonic()
             logger.debug("Calling process_session_sync()...")
-            result = process_session_sync(UUID(session_id))
-            elapsed = time.time() - start_time
+            result = process_session_sync(session_id)
+            elapsed = time.monotonic() - start_time
             
             # Success!
             logger.info("✅ " + "=" * 68)
-            logger.info(f"✅ Session {session_id} completed successfully!")
-            logger.info(f"✅ Duration: {elapsed:.1f}s")
-            logger.info(f"✅ Speakers: {result.get('speakers', 0)}")
-            logger.info(f"✅ Segments: {result.get('segments', 0)}")
-            logger.info(f"✅ Total words: {result.get('total_words', 0)}")
-            logger.debug(f"✅ Full result: {result}")
+            logger.info("✅ Session %s completed successfully!", session_id)
+            logger.info("✅ Duration: %.1fs", elapsed)
+            logger.info("✅ Speakers: %s", result.get('speakers', 0))
+            logger.info("✅ Segments: %s", result.get('segments', 0))
+            logger.info("✅ Total words: %s", result.get('total_words', 0))
+            logger.debug("✅ Full result: %s", result)
             logger.info("✅ " + "=" * 68)
             
             return True
@@ -185,30 +351,38 @@ def process_job(job_data: Dict, redis_client: redis.Redis) -> bool:
             last_error = e
             error_msg = str(e)
             
-            logger.error(f"❌ Attempt {attempt}/{MAX_RETRIES} failed")
-            logger.error(f"❌ Error: {error_msg}")
-            logger.debug(f"❌ Exception type: {type(e).__name__}", exc_info=True)
+            logger.error("❌ Attempt %s/%s failed", attempt, MAX_RETRIES)
+            logger.error("❌ Error: %s", error_msg)
+            logger.debug("❌ Exception type: %s", type(e).__name__, exc_info=True)
             
             if attempt < MAX_RETRIES:
                 # Exponential backoff: 5s, 10s, 20s
                 delay = RETRY_DELAY_BASE * (2 ** (attempt - 1))
-                logger.info(f"⏳ Retrying in {delay} seconds...")
-                logger.debug(f"   Next attempt will be {attempt + 1}/{MAX_RETRIES}")
-                time.sleep(delay)
-            else:
-                # Final failure after all retries
-                logger.error("=" * 70)
-                logger.error(f"💥 Job FAILED after {MAX_RETRIES} attempts")
-                logger.error(f"💥 Session: {session_id}")
-                logger.error(f"💥 Final error: {error_msg}")
-                logger.debug(f"💥 Exception details:", exc_info=True)
-                logger.error("=" * 70)
-                
-                # Update session status in database
-                logger.debug("Marking session as failed in database...")
-                update_session_failure(session_id, error_msg)
+                logger.info("⏳ Retrying in %s seconds...", delay)
+                logger.debug("   Next attempt will be %s/%s", attempt + 1, MAX_RETRIES)
+                # Returns early (True) if a shutdown signal arrives meanwhile
+                if not shutdown_event.wait(delay):
+                    continue
                 
-                return False
+                # A deploy or restart must not turn a retryable error into a
+                # failed session; the next worker picks the job up instead
+                logger.warning("🛑 Shutdown requested, returning session %s to the queue", session_id)
+                update_session_requeued(session_id)
+                return None
+            
+            # Final failure after all retries
+            logger.error("=" * 70)
+            logger.error("💥 Job FAILED after %s attempts", attempt)
+            logger.error("💥 Session: %s", session_id)
+            logger.error("💥 Final error: %s", error_msg)
+            logger.debug("💥 Exception details:", exc_info=True)
+            logger.error("=" * 70)
+            
+            # Update session status in database
+            logger.debug("Marking session as failed in database...")
+            update_session_failure(session_id, error_msg)
+            
+            return False
     
     return False
 
@@ -217,6 +391,13 @@ def process_job(job_data: Dict, redis_client: redis.Redis) -> bool:
 # MAIN WORKER LOOP
 # ============================================================================
 
+def format_uptime(start: float) -> str:
+    """Format time since `start` (a time.monotonic() reading) as '1h 2m 3s'."""
+    minutes, seconds = divmod(int(time.monotonic() - start), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes}m {seconds}s"
+
+
 def main():
     """
     Main worker loop.
@@ -228,82 +409,74 @@ def main():
     logger.debug("Registering signal handlers...")
     signal.signal(signal.SIGTERM, signal_handler)
     signal.signal(signal.SIGINT, signal_handler)
+    threading.Thread(target=unblock_on_shutdown, name="unblock-on-shutdown", daemon=True).start()
     
     # Banner
     logger.info("=" * 70)
     logger.info("🚀 LahStats ML Processing Worker")
     logger.info("=" * 70)
-    logger.info(f"📋 Processing Queue: {PROCESSING_QUEUE}")
-    logger.info(f"📋 Failed Queue: {FAILED_QUEUE}")
-    logger.info(f"🔄 Max Retries: {MAX_RETRIES}")
-    logger.info(f"⏱️  Retry Delays: {RETRY_DELAY_BASE}s, {RETRY_DELAY_BASE*2}s, {RETRY_DELAY_BASE*4}s")
-    logger.info(f"🔌 Redis URL: {settings.REDIS_URL}")
-    logger.debug(f"🔧 Redis Timeout: {REDIS_TIMEOUT}s")
-    logger.debug(f"🔧 Shutdown Timeout: {SHUTDOWN_TIMEOUT}s")
+    logger.info("📋 Processing Queue: %s", PROCESSING_QUEUE)
+    logger.info("📋 Failed Queue: %s", FAILED_QUEUE)
+    logger.info("🔄 Max Retries: %s", MAX_RETRIES)
+    logger.info("⏱️  Retry Delays: %ss, %ss, %ss", RETRY_DELAY_BASE, RETRY_DELAY_BASE*2, RETRY_DELAY_BASE*4)
+    logger.info("🔌 Redis URL: %s", settings.REDIS_URL)
+    logger.debug("🔧 Redis Timeout: %ss", REDIS_TIMEOUT)
+    logger.debug("🔧 Shutdown Timeout: %ss", SHUTDOWN_TIMEOUT)
     logger.info("=" * 70)
     
     # Connect to Redis
     logger.debug("Initializing Redis connection...")
     try:
-        redis_client = redis.from_url(
-            settings.REDIS_URL,
-            decode_responses=True,
-            socket_connect_timeout=5,
-            socket_keepalive=True,
-            health_check_interval=30
-        )
+        redis_client = create_worker_redis_client()
         
         # Test connection
         logger.debug("Testing Redis connection with PING...")
         redis_client.ping()
+        blocking_client = create_blocking_client(redis_client)
         logger.info("✅ Redis connection established")
-        logger.debug(f"   Connection info: {redis_client.connection_pool}")
+        logger.debug("   Connection info: %s", redis_client.connection_pool)
         logger.info("👂 Listening for jobs... (Press Ctrl+C to stop)")
         logger.info("-" * 70)
         
     except Exception as e:
-        logger.error(f"❌ Failed to connect to Redis: {e}", exc_info=True)
-        logger.error(f"💡 Make sure Redis is running: redis-server")
-        logger.error(f"💡 Or start with Docker: docker run -d -p 6379:6379 redis:latest")
+        logger.error("❌ Failed to connect to Redis: %s", e, exc_info=True)
+        logger.error("💡 Make sure Redis is running: redis-server")
+        logger.error("💡 Or start with Docker: docker run -d -p 6379:6379 redis:latest")
         sys.exit(1)
     
     # Job processing statistics
     jobs_processed = 0
     jobs_succeeded = 0
     jobs_failed = 0
-    worker_start_time = time.time()
+    worker_start_time = time.monotonic()
     
     logger.debug("Entering main processing loop...")
     
     # Main processing loop
-    while not shutdown_requested:
+    while not shutdown_event.is_set():
         try:
-            logger.debug(f"Waiting for job from queue '{PROCESSING_QUEUE}'...")
+            logger.debug("Waiting for job from queue '%s'...", PROCESSING_QUEUE)
+            job_payload = dequeue_job(blocking_client)
             
-            # Blocking pop with timeout (allows checking shutdown flag)
-            result = redis_client.brpop(PROCESSING_QUEUE, timeout=REDIS_TIMEOUT)
-            
-            if result is None:
-                # Timeout - no job available, check shutdown and continue
-                logger.debug("No job available (timeout), continuing...")
+            if job_payload is None:
+                # Timeout or shutdown - loop condition decides
                 continue
             
-            _, job_data_str = result
             jobs_processed += 1
             
-            logger.debug(f"Received job #{jobs_processed}")
-            logger.debug(f"Raw job data: {job_data_str}")
+            logger.debug("Received job #%s", jobs_processed)
+            logger.debug("Raw job data: %s", job_payload)
             
             # Parse job data
             try:
-                job_data = json.loads(job_data_str)
-                logger.debug(f"Parsed job data: {job_data}")
+                job_data = json_loads(job_payload)
+                logger.debug("Parsed job data: %s", job_data)
             except json.JSONDecodeError as e:
-                logger.error(f"❌ Invalid JSON in job: {e}")
-                logger.error(f"   Raw data: {job_data_str[:100]}")
+                logger.error("❌ Invalid JSON in job: %s", e)
+                logger.error("   Raw data: %s", job_payload[:100])
                 # Move to failed queue for inspection
-                logger.debug(f"Moving invalid job to {FAILED_QUEUE}...")
-                redis_client.lpush(FAILED_QUEUE, job_data_str)
+                logger.debug("Moving invalid job to %s...", FAILED_QUEUE)
+                redis_client.lpush(FAILED_QUEUE, job_payload)
                 jobs_failed += 1
                 continue
             
@@ -311,67 +484,70 @@ def main():
             logger.debug("Calling process_job()...")
             success = process_job(job_data, redis_client)
             
-            if success:
+            if success is None:
+                # RPUSH puts it back at the consuming end, so it is next in line
+                redis_client.rpush(PROCESSING_QUEUE, job_payload)
+                logger.info("↩️  Job returned to %s", PROCESSING_QUEUE)
+            elif success:
                 jobs_succeeded += 1
-                logger.debug(f"Job succeeded. Total successes: {jobs_succeeded}")
+                logger.debug("Job succeeded. Total successes: %s", jobs_succeeded)
             else:
                 jobs_failed += 1
                 # Move failed job to failed queue for inspection/retry
-                logger.debug(f"Moving failed job to {FAILED_QUEUE}...")
-                redis_client.lpush(FAILED_QUEUE, job_data_str)
-                logger.warning(f"📦 Job moved to failed queue: {FAILED_QUEUE}")
+                logger.debug("Moving failed job to %s...", FAILED_QUEUE)
+                redis_client.lpush(FAILED_QUEUE, job_payload)
+                logger.warning("📦 Job moved to failed queue: %s", FAILED_QUEUE)
             
-            # Calculate uptime
-            uptime_seconds = int(time.time() - worker_start_time)
-            uptime_str = f"{uptime_seconds // 3600}h {(uptime_seconds % 3600) // 60}m {uptime_seconds % 60}s"
+            logger.info("📊 Stats: %s succeeded, %s failed, %s total", jobs_succeeded, jobs_failed, jobs_processed)
             
-            logger.info(f"📊 Stats: {jobs_succeeded} succeeded, {jobs_failed} failed, {jobs_processed} total")
-            logger.debug(f"📊 Uptime: {uptime_str}")
+            # Uptime is only logged at DEBUG, so skip computing it otherwise
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("📊 Uptime: %s", format_uptime(worker_start_time))
             logger.info("")
             
         except RedisConnectionError as e:
-            logger.error(f"❌ Redis connection lost: {e}")
+            logger.error("❌ Redis connection lost: %s", e)
             logger.info("🔄 Attempting to reconnect in 5 seconds...")
             logger.debug("Connection error details:", exc_info=True)
-            time.sleep(5)
+            if shutdown_event.wait(5):
+                break
             
             try:
                 logger.debug("Reconnecting to Redis...")
-                redis_client = redis.from_url(
-                    settings.REDIS_URL,
-                    decode_responses=True,
-                    socket_connect_timeout=5,
-                    socket_keepalive=True,
-                    health_check_interval=30
-                )
+                blocking_client.close()
+                redis_client.close()
+                redis_client = create_worker_redis_client()
                 redis_client.ping()
+                blocking_client = create_blocking_client(redis_client)
                 logger.info("✅ Reconnected to Redis")
             except Exception as reconnect_error:
-                logger.error(f"❌ Reconnection failed: {reconnect_error}", exc_info=True)
+                logger.error("❌ Reconnection failed: %s", reconnect_error, exc_info=True)
             
         except KeyboardInterrupt:
             logger.info("⌨️  Keyboard interrupt received")
             break
             
         except Exception as e:
-            logger.error(f"❌ Unexpected error in worker loop: {e}", exc_info=True)
+            logger.error("❌ Unexpected error in worker loop: %s", e, exc_info=True)
             logger.debug("Pausing for 1 second before continuing...")
-            time.sleep(1)  # Brief pause before continuing
+            shutdown_event.wait(1)  # Brief pause before continuing
+    
+    blocking_client.close()
+    close_worker_db()
     
     # Shutdown summary
-    uptime_seconds = int(time.time() - worker_start_time)
-    uptime_str = f"{uptime_seconds // 3600}h {(uptime_seconds % 3600) // 60}m {uptime_seconds % 60}s"
+    uptime_str = format_uptime(worker_start_time)
     
     logger.info("")
     logger.info("=" * 70)
     logger.info("🛑 Worker Shutdown Complete")
     logger.info("=" * 70)
-    logger.info(f"📊 Final Stats:")
-    logger.info(f"   Total Jobs: {jobs_processed}")
-    logger.info(f"   Succeeded: {jobs_succeeded}")
-    logger.info(f"   Failed: {jobs_failed}")
-    logger.info(f"   Uptime: {uptime_str}")
-    logger.debug(f"   Success Rate: {(jobs_succeeded / jobs_processed * 100) if jobs_processed > 0 else 0:.1f}%")
+    logger.info("📊 Final Stats:")
+    logger.info("   Total Jobs: %s", jobs_processed)
+    logger.info("   Succeeded: %s", jobs_succeeded)
+    logger.info("   Failed: %s", jobs_failed)
+    logger.info("   Uptime: %s", uptime_str)
+    logger.debug("   Success Rate: %.1f%%", (jobs_succeeded / jobs_processed * 100) if jobs_processed > 0 else 0)
     logger.info("=" * 70)
     
     logger.debug("Worker exiting with code 0")